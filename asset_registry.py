@@ -0,0 +1,363 @@
+"""
+Registry of the report's figures, built once per process at startup.
+
+start() scans FIGURE_PATTERNS (the same directories optimize_images.py
+builds), reads the header of every figure, and checks the ones the report
+references: the section figures and the carousels of content.json, which
+include the video poster. Anything missing or unreadable is logged, or raises
+AssetError when APP_STRICT_ASSETS is set, so a bad deploy fails at startup
+instead of on the page that shows the figure. It then warms up in the background, doing ahead of the first visitor
+what a cold visit would otherwise pay for:
+    - every referenced figure without current optimize_images.py variants is
+      decoded and encoded into the media store (see media_store.py), with its
+      carousel thumbnail
+    - the modules Streamlit imports on the first render of a custom component
+      (PyArrow and pandas, ~0.5s) are imported
+status() reports the progress; serve.py answers /ready with it. If building
+the registry fails unexpectedly, the error is reported and the next start()
+tries again; if the warm-up fails, the registry is ready without it, as a cold
+visit then only takes longer.
+
+The registry lives in this module rather than in st.cache_resource, so the
+script runs of streamlit_app.py and serve.py share one. PIL, PyArrow and
+pandas are only imported by the warm-up and the encoders, off the app's
+import path (see benchmarks/import_time.py).
+
+Environment variables:
+    APP_STRICT_ASSETS=1     raises AssetError at startup if a referenced figure is missing
+
+Usage (checks and warms up once, e.g. in CI or before a deploy; exits with status 1 on problems):
+    python asset_registry.py
+"""
+import glob
+import io
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+
+import media_store
+import report_content
+
+STRICT = os.environ.get("APP_STRICT_ASSETS", "").lower() not in ("", "0", "false", "no")
+
+CONTENT_PATH = "content.json"
+# Figure sources, as in optimize_images.SOURCE_PATTERNS
+FIGURE_PATTERNS = [
+    "cnn_images/*.png",
+    "logistic_images/*.png",
+    "svm_images/*.png",
+    "comparison_images/*.png",
+    "*.png"
+]
+# Figure variants written by optimize_images.py
+OPTIMIZED_IMAGE_DIR = os.path.join("static", "img")
+IMAGE_MANIFEST_PATH = os.path.join(OPTIMIZED_IMAGE_DIR, "manifest.json")
+# Figures without optimized variants are encoded into the media store and
+# served by URL to every session
+MEDIA_DIR = os.path.join("static", "media")
+MEDIA_URL = "app/static/media"
+# Widest image the app serves unscaled (2x the 730px content column)
+MAX_IMAGE_WIDTH = 1460
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+logger = logging.getLogger(__name__)
+
+
+class AssetError(Exception):
+    """
+    Raised by start() when APP_STRICT_ASSETS is set and a referenced figure is
+    missing, or the registry cannot be built.
+    """
+
+
+# Process-wide, like the media store it fills
+_lock = threading.Lock()
+_state = "idle"  # idle -> warming -> ready, back to idle if the build fails, or failed if strict
+_figures = {}  # path -> {"path", "width", "height", "optimized", "error"}
+_referenced = []
+_problems = []
+_warm_up_seconds = None
+_failure = None  # The AssetError of a strict start, raised again by every later call
+_error = None  # The last unexpected error of the build or the warm-up, as a message
+_media_store = media_store.MediaStore(MEDIA_DIR, MEDIA_URL)
+_stored = {}  # (path, thumbnail) -> (mtime_ns, stored image or None)
+
+
+# ---------------------------
+# Encoding
+# ---------------------------
+def encode_png(image_path):
+    """
+    Returns an image as PNG bytes, at most MAX_IMAGE_WIDTH wide, which st.image
+    passes through untouched.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        image.load()
+        if image.width > MAX_IMAGE_WIDTH:
+            height = round(image.height * MAX_IMAGE_WIDTH / image.width)
+            image = image.resize((MAX_IMAGE_WIDTH, height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def encode_thumbnail(image_path):
+    """
+    Returns a small JPEG preview of an image, the same as optimize_images.py writes.
+    """
+    from PIL import Image
+
+    import optimize_images
+
+    with Image.open(image_path) as image:
+        return optimize_images.encode_thumbnail(image)[0]
+
+
+def stored_image(image_path, mtime, thumbnail=False):
+    """
+    Writes an image, or its thumbnail, to the media store once per (path, mtime).
+    Only the URL stays in memory; the bytes are not kept.
+
+    Returns:
+        dict: {"url", "width", "height"} ({"url"} only for a thumbnail), or
+        None if the store cannot be written to.
+    """
+    key = (image_path, thumbnail)
+    with _lock:
+        cached = _stored.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    data = encode_thumbnail(image_path) if thumbnail else encode_png(image_path)
+    url = _media_store.put(os.path.splitext(image_path)[0].replace(os.sep, "-"), data,
+                           "jpg" if thumbnail else "png")
+    stored = None
+    if url is not None:
+        stored = {"url": url}
+        if not thumbnail:
+            # Size from the PNG header, for the <img> to reserve its space
+            stored["width"], stored["height"] = struct.unpack(">II", data[16:24])
+    with _lock:
+        _stored[key] = (mtime, stored)
+    return stored
+
+
+# ---------------------------
+# Registry
+# ---------------------------
+def _optimized_entries():
+    """
+    Returns the optimize_images.py manifest entries whose source is unchanged
+    (or absent, when deployed with the variants only) and whose files all exist.
+    """
+    try:
+        with open(IMAGE_MANIFEST_PATH) as f:
+            manifest = json.load(f)["images"]
+    except FileNotFoundError:
+        return {}
+    entries = {}
+    for path, entry in manifest.items():
+        try:
+            if os.stat(path).st_mtime_ns != entry["mtime_ns"]:
+                continue
+        except FileNotFoundError:
+            pass
+        files = [variant["file"] for variant in entry["variants"]] + [entry["thumbnail"]["file"]]
+        if all(os.path.exists(os.path.join(OPTIMIZED_IMAGE_DIR, file_name)) for file_name in files):
+            entries[path] = entry
+    return entries
+
+
+def _inspect(path, entry):
+    """
+    Reads the size of a figure from its PNG header, or from its optimized
+    variants if only those were deployed. Decoding errors only show up in the warm-up.
+    """
+    figure = {"path": path, "width": None, "height": None, "optimized": entry is not None, "error": None}
+    try:
+        with open(path, "rb") as f:
+            header = f.read(24)
+    except FileNotFoundError:
+        if entry is None:
+            figure["error"] = "not found"
+        else:
+            widest = max(entry["variants"], key=lambda v: v["width"])
+            figure["width"], figure["height"] = widest["width"], widest["height"]
+        return figure
+    except OSError as e:
+        figure["error"] = f"unreadable: {e}"
+        return figure
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE):
+        figure["error"] = "not a PNG file"
+    else:
+        figure["width"], figure["height"] = struct.unpack(">II", header[16:24])
+    return figure
+
+
+def _referenced_figures(problems):
+    try:
+        content = report_content.load_content(CONTENT_PATH)
+    except (OSError, ValueError) as e:
+        problems.append(f"{CONTENT_PATH}: {e}")
+        return []
+    section_figures = [content["figures"][name] for name in report_content.FIGURES]
+    carousel_figures = [path for name in report_content.CAROUSELS for path in content["carousels"][name]]
+    return list(dict.fromkeys(section_figures + carousel_figures))
+
+
+def build():
+    """
+    Scans and inspects every figure and checks the referenced ones.
+
+    Returns:
+        tuple: ({path: figure}, [referenced paths], [problems as messages]).
+    """
+    problems = []
+    referenced = _referenced_figures(problems)
+    entries = _optimized_entries()
+    scanned = {path for pattern in FIGURE_PATTERNS for path in glob.glob(pattern)}
+    figures = {path: _inspect(path, entries.get(path)) for path in sorted(scanned | set(referenced) | set(entries))}
+    problems.extend(f"{path}: {figures[path]['error']}" for path in referenced if figures[path]["error"])
+    return figures, referenced, problems
+
+
+def warm_up(figures, referenced):
+    """
+    Encodes the referenced figures that have no optimized variants into the media
+    store, and imports what the first custom component render would. Returns the
+    problems found on the way.
+    """
+    problems = []
+    for path in referenced:
+        figure = figures[path]
+        if figure["optimized"] or figure["error"]:
+            continue
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            stored_image(path, mtime)
+            stored_image(path, mtime, thumbnail=True)
+        except Exception as e:
+            figure["error"] = f"could not be encoded: {e}"
+            problems.append(f"{path}: {figure['error']}")
+    try:
+        # Imported by Streamlit on the first render of a custom component, which
+        # also checks each list argument with pandas
+        import pandas  # noqa: F401
+        import pyarrow  # noqa: F401
+        from streamlit.components.v1 import component_arrow  # noqa: F401
+    except ImportError as e:
+        problems.append(f"custom components need PyArrow and pandas: {e}")
+    return problems
+
+
+def _warm_up_in_background(figures, referenced):
+    global _state, _warm_up_seconds, _error
+    start = time.perf_counter()
+    try:
+        problems = warm_up(figures, referenced)
+    except Exception as e:
+        # The figures were checked; only the caches stay cold
+        logger.exception("asset warm-up failed")
+        problems = []
+        with _lock:
+            _error = f"warm-up failed: {e!r}"
+    for problem in problems:
+        logger.warning("asset warm-up: %s", problem)
+    with _lock:
+        _problems.extend(problems)
+        _warm_up_seconds = time.perf_counter() - start
+        _state = "ready"
+    logger.info("assets ready: %d figures warmed up in %.2fs", len(referenced), _warm_up_seconds)
+
+
+def start(strict=STRICT):
+    """
+    Builds the registry and starts the warm-up in a background thread, once per
+    process; later calls return at once, or raise the same AssetError again if
+    a strict start failed, so no script run renders with figures missing. If
+    the build itself fails, the error is logged and reported by status(), and
+    the next call tries again (in strict mode, it raises AssetError instead).
+
+    Args:
+        strict (bool): Raise AssetError instead of logging if a referenced figure is missing.
+    """
+    global _state, _failure, _error
+    with _lock:
+        if _failure is not None:
+            raise _failure
+        if _state != "idle":
+            return
+        _state = "warming"
+    try:
+        figures, referenced, problems = build()
+    except Exception as e:
+        logger.exception("asset registry could not be built")
+        with _lock:
+            _error = f"build failed: {e!r}"
+            if not strict:
+                _state = "idle"
+                return
+            _state = "failed"
+            _failure = AssetError(_error)
+        raise _failure from e
+    for problem in problems:
+        logger.warning("asset registry: %s", problem)
+    with _lock:
+        _error = None
+        _figures.update(figures)
+        _referenced.extend(referenced)
+        _problems.extend(problems)
+        if strict and problems:
+            _state = "failed"
+            _failure = AssetError("; ".join(problems))
+            raise _failure
+    threading.Thread(target=_warm_up_in_background, args=(figures, referenced),
+                     name="asset-warm-up", daemon=True).start()
+
+
+def figure(path):
+    """
+    Returns the registry's record of a figure ({"path", "width", "height",
+    "optimized", "error"}), or None if it was not found at startup.
+    """
+    with _lock:
+        return _figures.get(path)
+
+
+def status():
+    """
+    Returns {"state", "figures", "referenced", "problems", "error",
+    "warm_up_seconds"}; the state is "ready" once the warm-up is done, and
+    "error" is the last unexpected failure, if any.
+    """
+    with _lock:
+        return {
+            "state": _state,
+            "figures": len(_figures),
+            "referenced": len(_referenced),
+            "problems": list(_problems),
+            "error": _error,
+            "warm_up_seconds": None if _warm_up_seconds is None else round(_warm_up_seconds, 3)
+        }
+
+
+def main():
+    figures, referenced, problems = build()
+    problems += warm_up(figures, referenced)
+    optimized = sum(figures[path]["optimized"] for path in referenced)
+    print(f"{len(figures)} figures, {len(referenced)} referenced: {optimized} with optimized variants, "
+          f"{len(referenced) - optimized} in the media store ({_media_store.writes} written)")
+    for problem in problems:
+        print(f"  {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
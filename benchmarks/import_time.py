@@ -0,0 +1,84 @@
+"""
+Import-time report and startup budget for streamlit_app.py.
+
+Imports the app in fresh interpreters with `python -X importtime`, keeps the
+fastest run, and prints the total, the app's direct imports and the slowest
+modules by self time. Exits with status 1 if the import exceeds the budget or
+pulls in a module that must stay off the startup path (see DEFERRED_MODULES),
+so a new top-level import that slows down cold starts does not go unnoticed.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms MS] [--runs N] [--top N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Streamlit alone takes ~0.5s to import; the app should add little on top of it
+DEFAULT_BUDGET_MS = 800
+# Heavy modules that only some pages need, imported inside the functions that use them
+DEFERRED_MODULES = ["pandas", "PIL.Image"]
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure():
+    """
+    Imports streamlit_app once in a new interpreter and returns
+    [(module, self_us, cumulative_us, depth)] in the order -X importtime prints them.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit_app"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"maximum import time of streamlit_app (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--runs", type=int, default=5, help="imports to run, the fastest one is reported")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    modules = min(runs, key=lambda run: run[-1][2])
+    total_ms = modules[-1][2] / 1000
+
+    print(f"streamlit_app imported in {total_ms:.1f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print("\ndirect imports (cumulative):")
+    # Children are printed before their parent, so the app's own imports are
+    # the depth-1 entries between the previous top-level module and the app
+    start = max(i for i, module in enumerate(modules[:-1]) if module[3] == 0) + 1
+    direct = [module for module in modules[start:-1] if module[3] == 1]
+    for name, _, cumulative_us, _ in sorted(direct, key=lambda module: -module[2]):
+        print(f"  {name:<40} {cumulative_us / 1000:8.1f} ms")
+    print(f"  {'(module body)':<40} {modules[-1][1] / 1000:8.1f} ms")
+    print("\nslowest modules (self):")
+    for name, self_us, _, _ in sorted(modules, key=lambda module: -module[1])[:args.top]:
+        print(f"  {name:<40} {self_us / 1000:8.1f} ms")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    imported = {module[0] for module in modules}
+    for name in DEFERRED_MODULES:
+        if name in imported:
+            failures.append(f"{name} is imported at startup; import it where it is used instead")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Browserless sessions against a locally launched `streamlit run streamlit_app.py`,
+for the benchmarks that measure the server rather than the script.
+
+launch_server() starts the app on a free localhost port and stops it on exit.
+A Session speaks the websocket protocol of Streamlit's frontend: each rerun
+sends a BackMsg (a page visit or widget values) and reads ForwardMsgs until the
+run finishes. Like the browser, it reports the message hashes it already holds,
+so the server can send references instead of repeating cached messages, and
+resolves those references. It follows the query string the app sets, as the
+address bar would, and keeps the last arguments of every custom
+component, so a benchmark can answer them the way the component's frontend would.
+
+Server RSS and CPU time are read from /proc, so these benchmarks need Linux.
+"""
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Seconds to wait for the server to answer its health check
+STARTUP_TIMEOUT = 60
+
+
+@dataclass
+class Server:
+    pid: int
+    port: int
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.port}"
+
+
+@dataclass
+class Run:
+    """
+    What one rerun cost, as seen by the client.
+    """
+    seconds: float
+    messages: int
+    bytes: int
+    exceptions: int
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def launch_server(script="streamlit_app.py", env=None):
+    """
+    Runs `streamlit run <script>` from the repository root and yields a Server
+    once it is healthy. `env` adds to the current environment.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script,
+         "--server.port", str(port), "--server.address", "localhost", "--server.headless", "true",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=REPO_ROOT, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"streamlit run {script} exited with status {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"streamlit run {script} did not start within {STARTUP_TIMEOUT}s")
+                time.sleep(0.2)
+        yield Server(process.pid, port)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def server_stats(pid):
+    """
+    Returns the (RSS in bytes, user + system CPU seconds) of a process.
+    """
+    with open(f"/proc/{pid}/status") as f:
+        rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+    with open(f"/proc/{pid}/stat") as f:
+        # Fields after the parenthesized command name; utime and stime are the 14th and 15th
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return rss, cpu
+
+
+class Session:
+    """
+    One browser tab's websocket connection. Use `async with Session(server) as session`.
+    """
+    def __init__(self, server):
+        self.server = server
+        self.websocket = None
+        self.cached_messages = {}  # hash -> serialized ForwardMsg, as the browser keeps them
+        self.query_string = ""  # What the address bar would show after "?"
+        self.components = {}  # key -> {"id", "fragment_id", "args"} of each custom component
+
+    async def __aenter__(self):
+        self.websocket = await websockets.connect(
+            f"ws://localhost:{self.server.port}/_stcore/stream", subprotocols=["streamlit"], max_size=None
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.websocket.close()
+
+    async def rerun(self, page_name="", widget_states=None, fragment_id=""):
+        """
+        Asks for a run of a page, optionally with new widget values (a
+        WidgetStates protobuf) or of a single fragment, and waits for it to finish.
+        """
+        message = BackMsg()
+        message.rerun_script.query_string = self.query_string
+        message.rerun_script.page_name = page_name
+        message.rerun_script.fragment_id = fragment_id
+        message.rerun_script.cached_message_hashes.extend(sorted(self.cached_messages))
+        if widget_states is not None:
+            message.rerun_script.widget_states.CopyFrom(widget_states)
+
+        if not fragment_id:
+            # A full run sends every component the page still has
+            self.components.clear()
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        messages = 0
+        size = 0
+        exceptions = 0
+        while True:
+            raw = await self.websocket.recv()
+            messages += 1
+            size += len(raw)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "ref_hash":
+                forward.ParseFromString(self.cached_messages[forward.ref_hash])
+                kind = forward.WhichOneof("type")
+            elif forward.metadata.cacheable:
+                self.cached_messages[forward.hash] = raw
+            if kind == "page_info_changed":
+                self.query_string = forward.page_info_changed.query_string
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    exceptions += 1
+                elif element_type == "component_instance":
+                    args = json.loads(element.component_instance.json_args)
+                    self.components[args.get("key")] = {
+                        "id": element.component_instance.id,
+                        "fragment_id": forward.delta.fragment_id,
+                        "args": args
+                    }
+            if kind == "script_finished":
+                return Run(time.perf_counter() - start, messages, size, exceptions)
+
+    async def set_component_value(self, page_name, key, value):
+        """
+        Sends the value a custom component's frontend reports, which reruns the
+        fragment holding the component (or the page), and waits for the run.
+        """
+        component = self.components[key]
+        widget_states = WidgetStates()
+        widget = widget_states.widgets.add()
+        widget.id = component["id"]
+        widget.json_value = json.dumps(value)
+        return await self.rerun(page_name, widget_states, component["fragment_id"])
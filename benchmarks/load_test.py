@@ -0,0 +1,170 @@
+"""
+Multi-session load test of streamlit_app.py on localhost.
+
+Launches the app locally (see live_server.py) and, for each level in
+--sessions, keeps that many browserless sessions replaying a visitor for
+--duration seconds. A visitor:
+    - loads the app (the default page)
+    - scrolls through the report, i.e. visits every page in sidebar order,
+      pausing --think-ms between pages
+    - on each page with a carousel, reports the frame width the way the
+      carousel's frontend does once mounted, then clicks Next through every
+      slide, back to the first one
+
+Each level reports the p50/p95/p99 latency of a rerun (from the request to
+the end of the run), the reruns, messages and bytes received per second, and
+the server's CPU use (100% is one core) and RSS at the end of the level.
+
+Exits with status 1 if any rerun raised an exception, or if a level's p95
+exceeds --max-p95-ms, so it can gate a release. Needs no services other than
+the app, but reads /proc, so it needs Linux.
+
+Usage:
+    python benchmarks/load_test.py [--sessions 1,5,10,25] [--duration S] [--think-ms MS]
+                                   [--max-p95-ms MS] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import live_server  # noqa: E402
+
+# Width the carousel frontend reports: the 704px column on a 2x display
+FRAME_WIDTH = 1408
+
+
+def report_pages():
+    with open(os.path.join(live_server.REPO_ROOT, "content.json")) as f:
+        return [section["path"] for section in json.load(f)["sections"]]
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a non-empty list.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class Visitor:
+    """
+    One session replaying the visitor described in the module docstring, and
+    recording every rerun it makes.
+    """
+    def __init__(self, server, pages, think_seconds, deadline):
+        self.server = server
+        self.pages = pages
+        self.think_seconds = think_seconds
+        self.deadline = deadline
+        self.runs = []
+
+    async def think(self):
+        # Jittered, so the sessions do not stay in lockstep
+        await asyncio.sleep(self.think_seconds * random.uniform(0.5, 1.5))
+
+    async def browse_carousel(self, session, page, key):
+        carousel = session.components[key]["args"]
+        slides = len(carousel["slides"])
+        have = set()
+        for step in range(slides + 1):
+            if time.monotonic() > self.deadline:
+                return
+            index = step % slides
+            self.runs.append(await session.set_component_value(page, key, {
+                "index": index,
+                "have": sorted(have),
+                "thumbnails": True,
+                "width": FRAME_WIDTH
+            }))
+            have |= {int(i) for i in session.components[key]["args"]["images"]}
+            await self.think()
+
+    async def run(self):
+        while time.monotonic() < self.deadline:
+            async with live_server.Session(self.server) as session:
+                self.runs.append(await session.rerun())
+                for page in self.pages:
+                    if time.monotonic() > self.deadline:
+                        return
+                    await self.think()
+                    self.runs.append(await session.rerun(page))
+                    for key, component in list(session.components.items()):
+                        if component["args"].get("slides"):
+                            await self.browse_carousel(session, page, key)
+
+
+async def run_level(server, sessions, pages, duration, think_seconds):
+    deadline = time.monotonic() + duration
+    visitors = [Visitor(server, pages, think_seconds, deadline) for _ in range(sessions)]
+    _, cpu_before = live_server.server_stats(server.pid)
+    start = time.monotonic()
+    await asyncio.gather(*(visitor.run() for visitor in visitors))
+    elapsed = time.monotonic() - start
+    rss, cpu_after = live_server.server_stats(server.pid)
+
+    runs = [run for visitor in visitors for run in visitor.runs]
+    latencies = [run.seconds * 1000 for run in runs]
+    return {
+        "sessions": sessions,
+        "reruns": len(runs),
+        "exceptions": sum(run.exceptions for run in runs),
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "reruns_per_s": round(len(runs) / elapsed, 1),
+        "messages_per_s": round(sum(run.messages for run in runs) / elapsed, 1),
+        "kib_per_s": round(sum(run.bytes for run in runs) / elapsed / 1024, 1),
+        "server_cpu_percent": round((cpu_after - cpu_before) / elapsed * 100, 1),
+        "server_rss_mib": round(rss / 2**20, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", default="1,5,10,25",
+                        help="comma-separated concurrent session counts, one level each (default: 1,5,10,25)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per level (default: 30)")
+    parser.add_argument("--think-ms", type=float, default=500,
+                        help="mean pause between a visitor's actions (default: 500)")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if any level's p95 rerun latency exceeds this")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(",")]
+
+    pages = report_pages()
+    results = []
+    print(f"{'sessions':>8} {'reruns':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'reruns/s':>9} "
+          f"{'msgs/s':>8} {'KiB/s':>8} {'CPU':>7} {'RSS':>9}")
+    with live_server.launch_server() as server:
+        for sessions in levels:
+            result = asyncio.run(run_level(server, sessions, pages, args.duration, args.think_ms / 1000))
+            results.append(result)
+            print(f"{sessions:>8} {result['reruns']:>7} {result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms "
+                  f"{result['p99_ms']:>7.1f}ms {result['reruns_per_s']:>9.1f} {result['messages_per_s']:>8.1f} "
+                  f"{result['kib_per_s']:>8.1f} {result['server_cpu_percent']:>6.1f}% "
+                  f"{result['server_rss_mib']:>7.1f}MB")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"duration_s": args.duration, "think_ms": args.think_ms, "levels": results}, f, indent=2)
+        print(f"\nwrote {args.output}")
+
+    failures = []
+    if any(result["exceptions"] for result in results):
+        failures.append(f"{sum(result['exceptions'] for result in results)} reruns raised an exception")
+    if args.max_p95_ms is not None:
+        failures.extend(f"p95 of {result['p95_ms']}ms with {result['sessions']} sessions exceeds {args.max_p95_ms:.0f}ms"
+                        for result in results if result["p95_ms"] > args.max_p95_ms)
+    if failures:
+        print("FAIL: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Headless render benchmark for streamlit_app.py, driven by Streamlit's AppTest.
+
+Scenarios:
+    - initial:                  a first visit, i.e. a full run of main() (default page)
+    - page:<url path>:          the run of every section in SECTION_DISPLAYS
+    - <carousel>:next / :prev:  one Next/Previous step of each carousel
+    - <carousel>:wrap-around:   Next through every slide back to the first one
+Carousels take their slides from content.json, as the app shows them; a
+carousel replaced by charts of exported predictions is skipped.
+
+The carousels are a custom component, so a click is simulated the way the
+frontend reports it: the carousel's index plus the value its component would
+send (selected index, images already held, frame width). AppTest always reruns
+the whole script, so carousel steps include the rest of their page, which a
+real browser skips by rerunning only the carousel fragment.
+
+For every scenario the best and median wall time, the peak memory traced
+during one extra run, and the number and serialized size of the elements
+emitted are written as JSON, tagged with the current commit. Pass --compare
+with an earlier file to print the change and fail on wall time regressions.
+
+Usage:
+    python benchmarks/render_benchmark.py [--repeat N] [--output FILE] [--compare FILE] [--tolerance PCT]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+logging.disable(logging.WARNING)  # AppTest logs a warning per run outside `streamlit run`
+
+import streamlit  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import report_content  # noqa: E402
+import streamlit_app  # noqa: E402
+
+OUTPUT_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+# Width reported by the carousel frontend: the 704px column on a 2x display
+FRAME_WIDTH = 1408
+# content.json carousel -> (state key, page URL path); the slides are the
+# carousel's figures as the app filters them (see streamlit_app.carousel_figures())
+CAROUSELS = {
+    "cnn": ("carousel_index", "cnn-results-discussion"),
+    "logistic": ("logistic_carousel_index", "logistic-results-discussion"),
+    "svm": ("svm_carousel_index", "svm-results-discussion")
+}
+
+
+def app_script(repo_root, url_path):
+    """
+    The script AppTest runs: main() for the initial visit, or a single section.
+    """
+    import os
+    import sys
+
+    os.chdir(repo_root)
+    sys.path.insert(0, repo_root)
+    import streamlit_app
+
+    if url_path is None:
+        streamlit_app.main()
+    else:
+        streamlit_app.apply_custom_css()
+        streamlit_app.display_header()
+        streamlit_app.SECTION_DISPLAYS[url_path]()
+
+
+def new_app(url_path=None):
+    return AppTest.from_function(app_script, args=(REPO_ROOT, url_path), default_timeout=60)
+
+
+def element_stats(app):
+    """
+    Returns (count, bytes) of the elements in the app's last render.
+    """
+    count = size = 0
+    nodes = [app._tree]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(getattr(node, "children", {}).values())
+        proto = getattr(node, "proto", None)
+        if proto is not None and not getattr(node, "children", None):
+            count += 1
+            size += proto.ByteSize()
+    return count, size
+
+
+def carousel_images(app, state_key):
+    """
+    Returns the slide indices whose full images the carousel was sent in the last run.
+    """
+    nodes = [app._tree]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(getattr(node, "children", {}).values())
+        if getattr(node, "type", None) == "component_instance" and node.proto.id.endswith(f"-{state_key}_carousel"):
+            return {int(i) for i in json.loads(node.proto.json_args)["images"]}
+    raise LookupError(f"carousel {state_key} was not rendered")
+
+
+class CarouselSession:
+    """
+    One visitor's carousel: loads its page, then reports the frame width like
+    the frontend does once it is mounted, so the neighbours are prefetched.
+    """
+    def __init__(self, state_key, url_path, slides):
+        self.state_key = state_key
+        self.slides = slides
+        self.index = 0
+        self.app = new_app(url_path)
+        self.app.run()
+        self.have = set()
+        self.step(0)
+
+    def step(self, delta):
+        """
+        Simulates a click that moves the carousel by `delta` slides and reruns.
+        """
+        self.index = (self.index + delta) % self.slides
+        self.app.session_state[self.state_key] = self.index
+        self.app.session_state[f"{self.state_key}_carousel"] = {
+            "index": self.index,
+            "have": sorted(self.have),
+            "thumbnails": True,
+            "width": FRAME_WIDTH
+        }
+        self.app.run()
+        self.have |= carousel_images(self.app, self.state_key)
+        return self.app
+
+
+def scenarios():
+    """
+    Yields (name, prepare), where prepare() sets up fresh state and returns a
+    zero-argument callable performing the measured interaction. The callable
+    returns the AppTest whose elements are counted.
+    """
+    def initial():
+        app = new_app()
+        return lambda: app.run()
+    yield "initial", initial
+
+    for url_path in streamlit_app.SECTION_DISPLAYS:
+        def page(url_path=url_path):
+            app = new_app(url_path)
+            return lambda: app.run()
+        yield f"page:{url_path}", page
+
+    with contextlib.chdir(REPO_ROOT):  # The app's paths are relative to the repository root
+        carousels = report_content.load_content(streamlit_app.CONTENT_PATH)["carousels"]
+        shown = {name: streamlit_app.carousel_figures(carousels, name) for name in CAROUSELS}
+    for name, (state_key, url_path) in CAROUSELS.items():
+        figures = shown[name]
+        if figures is None:
+            continue  # Replaced by charts of the exported predictions
+        slides = len(figures)
+        for direction, delta in [("next", 1), ("prev", -1)]:
+            def click(state_key=state_key, url_path=url_path, slides=slides, delta=delta):
+                session = CarouselSession(state_key, url_path, slides)
+                return lambda: session.step(delta)
+            yield f"{name}:{direction}", click
+
+        def wrap_around(state_key=state_key, url_path=url_path, slides=slides):
+            session = CarouselSession(state_key, url_path, slides)
+
+            def run():
+                for _ in range(slides):
+                    app = session.step(1)
+                assert session.index == 0
+                return app
+            return run
+        yield f"{name}:wrap-around", wrap_around
+
+
+def measure(prepare, repeat):
+    timings = []
+    for _ in range(repeat):
+        interaction = prepare()
+        start = time.perf_counter()
+        app = interaction()
+        timings.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+
+    interaction = prepare()
+    tracemalloc.start()
+    try:
+        app = interaction()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    elements, size = element_stats(app)
+    return {
+        "wall_ms_best": round(min(timings) * 1000, 3),
+        "wall_ms_median": round(statistics.median(timings) * 1000, 3),
+        "peak_memory_kib": round(peak / 1024, 1),
+        "elements": elements,
+        "element_bytes": size
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the change in median wall time and element bytes against a baseline
+    file and returns the scenarios that got slower by more than `tolerance` percent.
+    """
+    regressions = []
+    print(f"\ncompared with {baseline.get('commit')}:")
+    for name, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        change = current["wall_ms_median"] / previous["wall_ms_median"] - 1
+        print(f"  {name:<40} {change:>+7.1%} time "
+              f"{current['element_bytes'] - previous['element_bytes']:>+8} bytes")
+        if change * 100 > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario")
+    parser.add_argument("--output", help=f"JSON file to write (default: {OUTPUT_DIR}/render-<commit>.json)")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=20, help="allowed median slowdown in percent")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "repeat": args.repeat,
+        "scenarios": {}
+    }
+    print(f"{'scenario':<40} {'best':>9} {'median':>9} {'peak':>10} {'elements':>8} {'bytes':>8}")
+    for name, prepare in scenarios():
+        result = measure(prepare, args.repeat)
+        results["scenarios"][name] = result
+        print(f"{name:<40} {result['wall_ms_best']:>7.1f}ms {result['wall_ms_median']:>7.1f}ms "
+              f"{result['peak_memory_kib']:>7.0f}KiB {result['elements']:>8} {result['element_bytes']:>8}")
+
+    output = args.output or os.path.join(OUTPUT_DIR, f"render-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"FAIL: slower than {args.tolerance:.0f}% on {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: ROC and precision-recall curves of large prediction sets.
+
+For each size, draws one class's labels and overlapping float32 scores (like an
+SVM on the hard classes), then times the steps of evaluation.evaluate() for
+that class: sorting and cumulative sums (operating_points), the exact curves,
+and their decimation for display. Reports how many points each curve has
+before and after decimation, the largest distance of a dropped point, the
+JSON size of what is sent (and, extrapolated, of the full curves), and checks
+the AUC against a rank-based computation that does not build the curve at all.
+
+Usage:
+    python benchmarks/roc_decimation.py [--sizes 100000 1000000 10000000] [--positive-share 0.25]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import evaluation  # noqa: E402
+
+
+def rank_auc(positive, scores):
+    """
+    The Mann-Whitney statistic: the probability that a positive outscores a negative, ties counting half.
+    """
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    # Average rank of each distinct score, 1-based
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    n_positive = int(positive.sum())
+    n_negative = len(scores) - n_positive
+    return float((ranks[positive].sum() - n_positive * (n_positive + 1) / 2) / (n_positive * n_negative))
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def json_size(x, y):
+    return len(json.dumps([{"x": float(a), "y": float(b)} for a, b in zip(x, y)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 5, 10 ** 6, 10 ** 7])
+    parser.add_argument("--positive-share", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'predictions':>12} {'sort+cumsum':>12} {'curves':>8} {'decimate':>9} "
+          f"{'ROC points':>17} {'PR points':>17} {'max error':>10} {'full JSON':>11} {'sent':>8} {'AUC error':>10}")
+    for n in args.sizes:
+        positive = rng.random(n) < args.positive_share
+        scores = (rng.normal(size=n) + 1.2 * positive).astype(np.float32).astype(np.float64)
+
+        points, sort_seconds = timed(evaluation.operating_points, positive, scores)
+        start = time.perf_counter()
+        fpr, tpr = evaluation.roc_curve(*points)
+        recall, precision = evaluation.pr_curve(*points)
+        auc = evaluation.auc(fpr, tpr)
+        curve_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        roc_kept, roc_error = evaluation.decimate(fpr, tpr)
+        pr_kept, pr_error = evaluation.decimate(recall, precision)
+        decimate_seconds = time.perf_counter() - start
+
+        sent_bytes = json_size(fpr[roc_kept], tpr[roc_kept]) + json_size(recall[pr_kept], precision[pr_kept])
+        full_bytes = sent_bytes / (len(roc_kept) + len(pr_kept)) * (len(fpr) + len(recall))
+        print(f"{n:>12,} {sort_seconds * 1000:>10.0f}ms {curve_seconds * 1000:>6.0f}ms {decimate_seconds * 1000:>7.0f}ms "
+              f"{len(fpr):>9,} -> {len(roc_kept):>4} {len(recall):>9,} -> {len(pr_kept):>4} "
+              f"{max(roc_error, pr_error):>10.4f} ~{full_bytes / 1024:>8.0f}KB {sent_bytes / 1024:>6.1f}KB "
+              f"{abs(auc - rank_auc(positive, scores)):>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
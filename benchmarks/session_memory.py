@@ -0,0 +1,119 @@
+"""
+Server memory per concurrent session for streamlit_app.py.
+
+Launches the app locally (see live_server.py) and opens sessions in batches.
+Every session visits each page of the report once and stays connected, as a
+reader with the report open in a tab. One session is opened first to warm up
+the process-wide caches, and is not counted. After each batch the server's RSS
+is sampled several times and the median kept; the growth per added session is
+the least-squares slope over all batches. The whole measurement is repeated on
+a fresh server --repeats times, and the spread of the slopes reported, as the
+RSS of a single run moves by megabytes with the allocator. The bytes each
+session received are reported alongside: figures sent inline would show up in both.
+
+Usage:
+    python benchmarks/session_memory.py [--sessions N] [--step N] [--repeats N]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import live_server  # noqa: E402
+
+# Seconds to let the server settle after a batch before reading its RSS
+SETTLE_SECONDS = 2
+# RSS samples per batch, SAMPLE_INTERVAL seconds apart
+SAMPLES = 5
+SAMPLE_INTERVAL = 0.5
+
+
+def report_pages():
+    with open(os.path.join(live_server.REPO_ROOT, "content.json")) as f:
+        return [section["path"] for section in json.load(f)["sections"]]
+
+
+async def open_session(stack, server, pages):
+    """
+    Opens a session that visits every page and stays open until `stack` closes.
+    Returns the bytes it received.
+    """
+    session = await stack.enter_async_context(live_server.Session(server))
+    received = 0
+    for page in pages:
+        received += (await session.rerun(page)).bytes
+    return received
+
+
+def slope(points):
+    """
+    Least-squares slope of [(x, y)].
+    """
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    return (sum((x - mean_x) * (y - mean_y) for x, y in points)
+            / sum((x - mean_x) ** 2 for x, _ in points))
+
+
+async def settled_rss(server):
+    """
+    Returns the median and the range of SAMPLES readings of the server's RSS.
+    """
+    await asyncio.sleep(SETTLE_SECONDS)
+    samples = []
+    for _ in range(SAMPLES):
+        samples.append(live_server.server_stats(server.pid)[0])
+        await asyncio.sleep(SAMPLE_INTERVAL)
+    return statistics.median(samples), max(samples) - min(samples)
+
+
+async def measure(server, sessions, step, pages):
+    """
+    Opens `sessions` sessions in batches of `step` after a warm-up session, and
+    returns the fitted memory per added session in bytes.
+    """
+    points = []
+    async with contextlib.AsyncExitStack() as stack:
+        await open_session(stack, server, pages)
+        rss, spread = await settled_rss(server)
+        points.append((0, rss))
+        print(f"{'sessions':>8} {'RSS':>10} {'spread':>8} {'per session':>12} {'received':>10}")
+        print(f"{0:>8} {rss / 2**20:>8.1f}MB {spread / 1024:>6.0f}KB   (after 1 warm-up session)")
+        for opened in range(step, sessions + 1, step):
+            received = await asyncio.gather(*(open_session(stack, server, pages) for _ in range(step)))
+            rss, spread = await settled_rss(server)
+            growth = (rss - points[-1][1]) / step
+            points.append((opened, rss))
+            print(f"{opened:>8} {rss / 2**20:>8.1f}MB {spread / 1024:>6.0f}KB {growth / 1024:>10.1f}KB "
+                  f"{sum(received) / step / 1024:>8.1f}KB")
+    return slope(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200, help="sessions to open in total (default: 200)")
+    parser.add_argument("--step", type=int, default=25, help="sessions opened per batch (default: 25)")
+    parser.add_argument("--repeats", type=int, default=3, help="runs, each on a fresh server (default: 3)")
+    args = parser.parse_args()
+    if args.sessions < 2 * args.step:
+        parser.error("--sessions must allow at least two batches of --step")
+
+    pages = report_pages()
+    slopes = []
+    for repeat in range(args.repeats):
+        print(f"run {repeat + 1} of {args.repeats}")
+        with live_server.launch_server() as server:
+            slopes.append(asyncio.run(measure(server, args.sessions, args.step, pages)))
+        print(f"  {slopes[-1] / 1024:.1f}KB per additional session\n")
+    print(f"{statistics.median(slopes) / 1024:.1f}KB of server memory per additional session "
+          f"({len(pages)} pages each): median of {len(slopes)} runs, "
+          f"range {min(slopes) / 1024:.1f} to {max(slopes) / 1024:.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: per-rerun cost of rendering the report's six HTML tables.
+
+Compares building a DataFrame and calling to_html for every table (what each
+rerun used to do), the same behind st.cache_data, and the pandas-free
+table_to_html from streamlit_app.py.
+
+Usage:
+    python benchmarks/table_rendering.py [--reruns N]
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)  # content.json is read relative to the repository
+logging.disable(logging.WARNING)  # st.cache_data warns when used outside `streamlit run`
+
+import pandas as pd  # noqa: E402
+import streamlit as st  # noqa: E402
+
+import streamlit_app  # noqa: E402
+
+TABLES = [
+    *streamlit_app.site_content()["metrics"].values(),
+    *(streamlit_app.contributions_table(stage) for stage in ["final", "midpoint", "proposal"])
+]
+
+
+def pandas_to_html(data):
+    return pd.DataFrame(data).to_html(index=False, classes='contribution-table', escape=False)
+
+
+cached_pandas_to_html = st.cache_data(show_spinner=False)(pandas_to_html)
+
+
+def rerun_pandas():
+    for data in TABLES:
+        pandas_to_html(data)
+
+
+def rerun_cached_pandas():
+    for data in TABLES:
+        cached_pandas_to_html(data)
+
+
+def rerun_table_to_html():
+    for data in TABLES:
+        streamlit_app.table_to_html(data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=200)
+    args = parser.parse_args()
+
+    rerun_cached_pandas()  # first call fills the cache
+    for name, rerun in [
+        ("pandas per rerun", rerun_pandas),
+        ("memoized pandas", rerun_cached_pandas),
+        ("table_to_html", rerun_table_to_html)
+    ]:
+        best = min(timeit.repeat(rerun, number=args.reruns, repeat=5)) / args.reruns
+        print(f"{name:<18} {best * 1000:8.3f} ms/rerun")
+
+
+if __name__ == "__main__":
+    main()
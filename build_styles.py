@@ -0,0 +1,227 @@
+"""
+Build-time stylesheet and font pipeline for streamlit_app.py.
+
+Reads styles/app.css and writes to static/:
+    - fonts/poppins-<weight>.<hash>.woff2: each weight in FONT_WEIGHTS, subset
+      to the Latin characters in LATIN_UNICODES
+    - css/app.<hash>.css: @font-face rules for those fonts followed by
+      styles/app.css, minified
+    - css/manifest.json: the file names of the stylesheet and of the fonts,
+      which serve.py preloads
+The app inlines the built stylesheet, and serve.py sends the fonts with
+immutable caching plus a preload hint on every page. Nothing is fetched from
+Google Fonts, so the report renders the same on a network without internet access.
+
+The fonts are subset from the Poppins TTFs in fonts/ (Poppins-Regular.ttf,
+Poppins-Medium.ttf and Poppins-SemiBold.ttf from Google Fonts, under the SIL
+Open Font License), which needs fonttools and brotli:
+    pip install fonttools brotli
+Without them, the stylesheet is built with the fonts of the previous build,
+if any. Otherwise the build fails. --remote-fonts opts in to importing Poppins
+from REMOTE_FONTS_URL instead; the manifest records it, so the components'
+frames load the same stylesheet. Nothing else contacts Google Fonts: an
+unbuilt checkout renders with an installed Poppins, or the system sans-serif.
+
+Usage:
+    python build_styles.py [--remote-fonts]
+"""
+import argparse
+import io
+import json
+import os
+import re
+import sys
+
+SOURCE_PATH = os.path.join("styles", "app.css")
+FONT_SOURCE_DIR = "fonts"
+OUTPUT_DIR = "static"
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "css", "manifest.json")
+MANIFEST_VERSION = 2
+# Where the app serves OUTPUT_DIR, relative to its pages (see serve.py)
+STATIC_URL = "app/static"
+# Poppins weights used by styles/app.css, by source file
+FONT_WEIGHTS = {
+    400: "Poppins-Regular.ttf",
+    500: "Poppins-Medium.ttf",
+    600: "Poppins-SemiBold.ttf"
+}
+# Poppins from Google Fonts, only for builds passed --remote-fonts
+REMOTE_FONTS_URL = "https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&display=swap"
+# Google Fonts' "latin" subset
+LATIN_UNICODES = (
+    "U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, U+0329, "
+    "U+2000-206F, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD"
+)
+
+
+class BuildError(Exception):
+    """
+    Raised when the fonts cannot be built and no fallback was allowed.
+    """
+
+
+def minify_css(css):
+    """
+    Strips comments and every whitespace CSS does not need. Enough for
+    styles/app.css, which has no strings or URLs containing spaces.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _unicodes(ranges):
+    codepoints = []
+    for part in ranges.split(","):
+        start, _, end = part.strip()[2:].partition("-")
+        codepoints.extend(range(int(start, 16), int(end or start, 16) + 1))
+    return codepoints
+
+
+def subset_font(source_path):
+    """
+    Returns the WOFF2 bytes of a TTF reduced to LATIN_UNICODES, without hinting.
+    """
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.hinting = False
+    options.desubroutinize = True
+    options.layout_features = ["kern", "liga", "calt"]
+    font = subset.load_font(source_path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=_unicodes(LATIN_UNICODES))
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    return buffer.getvalue()
+
+
+def _write(file_name, data):
+    path = os.path.join(OUTPUT_DIR, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return file_name.replace(os.sep, "/")
+
+
+def build_fonts():
+    """
+    Writes the subset fonts and returns {weight: file name relative to OUTPUT_DIR}.
+    Raises BuildError if the sources or fonttools are missing.
+    """
+    import optimize_images  # Imports PIL, which app startup avoids
+
+    missing = [name for name in FONT_WEIGHTS.values() if not os.path.exists(os.path.join(FONT_SOURCE_DIR, name))]
+    if missing:
+        raise BuildError(f"{', '.join(missing)} not found in {FONT_SOURCE_DIR}/")
+    try:
+        import brotli  # noqa: F401 (fontTools needs it for WOFF2)
+        import fontTools  # noqa: F401
+    except ImportError:
+        raise BuildError("subsetting needs fonttools and brotli (pip install fonttools brotli)") from None
+    fonts = {}
+    for weight, source_name in FONT_WEIGHTS.items():
+        data = subset_font(os.path.join(FONT_SOURCE_DIR, source_name))
+        fonts[weight] = _write(optimize_images.fingerprinted_name(f"fonts/poppins-{weight}", data, "woff2"), data)
+        print(f"{source_name:<22} {os.path.getsize(os.path.join(FONT_SOURCE_DIR, source_name)) / 1024:>7.1f}KB -> "
+              f"{fonts[weight]} {len(data) / 1024:.1f}KB", file=sys.stderr)
+    return fonts
+
+
+def previous_fonts():
+    """
+    Returns the fonts of the last build that still exist, as build_fonts() does.
+    """
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    fonts = {int(weight): file_name for weight, file_name in manifest["fonts"].items()}
+    if not all(os.path.exists(os.path.join(OUTPUT_DIR, file_name)) for file_name in fonts.values()):
+        return {}
+    return fonts
+
+
+def font_face_css(fonts):
+    return "".join(
+        f"@font-face {{font-family: 'Poppins'; font-style: normal; font-weight: {weight}; font-display: swap; "
+        f"src: url({STATIC_URL}/{file_name}) format('woff2'); unicode-range: {LATIN_UNICODES};}}"
+        for weight, file_name in sorted(fonts.items())
+    )
+
+
+def remove_outdated(directory, keep):
+    """
+    Deletes the built files of OUTPUT_DIR/directory other than `keep`.
+    """
+    path = os.path.join(OUTPUT_DIR, directory)
+    if not os.path.isdir(path):
+        return
+    for file_name in os.listdir(path):
+        if f"{directory}/{file_name}" not in keep and file_name != os.path.basename(MANIFEST_PATH):
+            os.remove(os.path.join(path, file_name))
+
+
+def build(remote_fonts=False):
+    """
+    Builds the fonts and the stylesheet, writes the manifest and returns it.
+    Paths are relative to the current directory, which must be the repository root.
+
+    Args:
+        remote_fonts (bool): If the fonts cannot be built and no previous build
+            has any, import them from REMOTE_FONTS_URL instead of raising BuildError.
+    """
+    import optimize_images
+
+    try:
+        fonts = build_fonts()
+    except BuildError as e:
+        fonts = previous_fonts()
+        if fonts:
+            print(f"keeping the fonts of the previous build: {e}", file=sys.stderr)
+        elif remote_fonts:
+            print(f"WARNING: loading Poppins from Google Fonts: {e}", file=sys.stderr)
+        else:
+            raise BuildError(f"cannot build the fonts: {e}. Add the Poppins TTFs, "
+                             f"or pass --remote-fonts to load them from Google Fonts") from None
+    with open(SOURCE_PATH, encoding="utf-8") as f:
+        source = f.read()
+    font_css = font_face_css(fonts) if fonts else f"@import url({REMOTE_FONTS_URL});"
+    css = minify_css(font_css + source).encode("utf-8")
+    stylesheet = _write(optimize_images.fingerprinted_name("css/app", css, "css"), css)
+    print(f"{SOURCE_PATH:<22} {len(source.encode('utf-8')) / 1024:>7.1f}KB -> {stylesheet} {len(css) / 1024:.1f}KB",
+          file=sys.stderr)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "stylesheet": stylesheet,
+        "fonts": {str(weight): fonts[weight] for weight in sorted(fonts)},
+        "remote_fonts": REMOTE_FONTS_URL if not fonts else None
+    }
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+    remove_outdated("css", {stylesheet})
+    remove_outdated("fonts", set(fonts.values()))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--remote-fonts", action="store_true",
+                        help="import Poppins from Google Fonts if the fonts cannot be built")
+    args = parser.parse_args()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        build(remote_fonts=args.remote_fonts)
+    except BuildError as e:
+        sys.exit(f"error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""
+Test-set metrics of the report's models, computed from their stored predictions.
+
+The notebooks save each model's test predictions with export_predictions(): the
+true labels and the per-class scores (probabilities, or SVM margins), a few KB
+to a few hundred KB compressed. evaluate() turns such a file into everything
+the results sections show: accuracy, macro-averaged precision, recall and F1,
+the per-class breakdown, the confusion matrix and one-vs-rest ROC and
+precision-recall curves, all with vectorized NumPy.
+
+A curve has one point per distinct score, i.e. up to one per test scan: sorting
+once and taking cumulative sums yields all of them in O(n log n). AUC and
+average precision are computed on those exact curves; what is displayed is a
+decimated copy with at most CURVE_MAX_POINTS points, within CURVE_TOLERANCE of
+the exact curve (see decimate()).
+
+The headline metrics come with percentile bootstrap confidence intervals:
+thousands of resamples of the test set at once, optionally across a process
+pool, and cached on disk per predictions file (see bootstrap_intervals()).
+
+Usage, to fill the interval cache ahead of time:
+    python evaluation.py predictions/*.npz [--workers N]
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PREDICTIONS_FORMAT_VERSION = 1
+# Bounds of the displayed curves: points, and distance from the exact curve in
+# the unit square (0.002 is 1px on a 500px chart)
+CURVE_MAX_POINTS = 200
+CURVE_TOLERANCE = 0.002
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_CONFIDENCE = 0.95
+# Resamples per job: jobs get their own seeds, so results do not depend on the number of workers
+BOOTSTRAP_JOB_SIZE = 250
+# Indices drawn at once within a job, bounding its memory to ~64MB
+BOOTSTRAP_BATCH_DRAWS = 2 ** 23
+# Where bootstrap_intervals() results are kept, by predictions file content
+CACHE_DIR = os.path.join(".cache", "evaluation")
+HEADLINE_METRICS = ["accuracy", "precision", "recall", "f1"]
+
+
+def export_predictions(path, labels, scores, classes):
+    """
+    Writes a model's test-set predictions for evaluate(). Call it from the notebooks.
+
+    Args:
+        path (str): Output .npz path, e.g. predictions/cnn.npz.
+        labels (array): (n,) true class indices.
+        scores (array): (n, classes) probabilities or decision function values.
+        classes (list): Class names, in the order of the score columns.
+    """
+    np.savez_compressed(
+        path,
+        version=PREDICTIONS_FORMAT_VERSION,
+        labels=np.asarray(labels, dtype=np.int32),
+        scores=np.asarray(scores, dtype=np.float32),
+        classes=np.array([str(name) for name in classes])
+    )
+
+
+def load_predictions(path):
+    """
+    Returns (labels, scores, classes) from a file written by export_predictions().
+    """
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data["version"])
+        if version != PREDICTIONS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported predictions format version {version} in {path}")
+        labels = data["labels"].astype(np.intp)
+        scores = data["scores"].astype(np.float64)
+        classes = [str(name) for name in data["classes"]]
+    if scores.ndim != 2 or scores.shape != (len(labels), len(classes)):
+        raise ValueError(f"{path}: expected scores of shape ({len(labels)}, {len(classes)}), got {scores.shape}")
+    return labels, scores, classes
+
+
+def confusion_matrix(labels, predicted, n_classes):
+    """
+    Returns the (n_classes, n_classes) matrix of counts, true classes as rows.
+    """
+    return np.bincount(labels * n_classes + predicted, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def _divide(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros(np.shape(numerator)), where=denominator > 0)
+
+
+def _class_rates(matrices):
+    """
+    Returns the per-class (precision, recall, f1) of (..., classes, classes) confusion matrices.
+    """
+    true_positives = np.diagonal(matrices, axis1=-2, axis2=-1).astype(np.float64)
+    precision = _divide(true_positives, matrices.sum(axis=-2))
+    recall = _divide(true_positives, matrices.sum(axis=-1))
+    f1 = _divide(2 * precision * recall, precision + recall)
+    return precision, recall, f1
+
+
+def per_class_metrics(matrix):
+    """
+    Returns the precision, recall, F1 and support of every class of a confusion matrix.
+    """
+    precision, recall, f1 = _class_rates(matrix)
+    return {"precision": precision, "recall": recall, "f1": f1, "support": matrix.sum(axis=1)}
+
+
+def operating_points(positive, scores):
+    """
+    Returns the cumulative (true positives, false positives) of the thresholds
+    at every distinct score, highest first, after a leading (0, 0).
+
+    Args:
+        positive (np.ndarray): (n,) booleans, True for the class's samples.
+        scores (np.ndarray): (n,) scores of that class.
+    """
+    order = np.argsort(-scores, kind="stable")
+    scores = scores[order]
+    true_positives = np.cumsum(positive[order])
+    false_positives = np.arange(1, len(scores) + 1) - true_positives
+    # A threshold admits every sample with its score, so keep the last of each run of ties
+    last_of_ties = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    return np.r_[0, true_positives[last_of_ties]], np.r_[0, false_positives[last_of_ties]]
+
+
+def _rates(counts):
+    return counts / counts[-1] if counts[-1] else counts.astype(np.float64)
+
+
+def roc_curve(true_positives, false_positives):
+    """
+    Returns the (false positive rates, true positive rates) of the ROC curve
+    through operating_points(), less the points on straight runs.
+    """
+    # Points in the middle of a horizontal or vertical run change neither the
+    # curve nor its area, and are most of the points of a good classifier
+    corners = np.r_[True, np.diff(false_positives, 2).astype(bool) | np.diff(true_positives, 2).astype(bool), True]
+    return _rates(false_positives[corners]), _rates(true_positives[corners])
+
+
+def pr_curve(true_positives, false_positives):
+    """
+    Returns the (recalls, precisions) of the precision-recall curve through
+    operating_points(), starting at (0, 1).
+    """
+    predicted = true_positives + false_positives
+    precision = np.divide(true_positives, predicted, out=np.ones(len(predicted)), where=predicted > 0)
+    return _rates(true_positives), precision
+
+
+def auc(fpr, tpr):
+    """
+    Returns the area under a curve by the trapezoidal rule.
+    """
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+
+
+def average_precision(recall, precision):
+    """
+    Returns the average precision of a precision-recall curve: the precision at
+    each threshold weighted by the recall it adds.
+    """
+    return float(np.sum(np.diff(recall) * precision[1:]))
+
+
+def decimate(x, y, max_points=CURVE_MAX_POINTS, tolerance=CURVE_TOLERANCE):
+    """
+    Picks the points of a polyline to keep when drawing it (Ramer-Douglas-Peucker,
+    always splitting the segment that strays farthest first): stops at
+    `max_points`, or as soon as no dropped point is farther than `tolerance`
+    from the simplified line.
+
+    Returns:
+        tuple: (indices of the kept points in order, largest distance of a dropped point)
+    """
+    n = len(x)
+    if n <= 2:
+        return np.arange(n), 0.0
+
+    def farthest(start, end):
+        """
+        Returns (distance, index) of the point between start and end farthest
+        from their chord.
+        """
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        xs = x[start + 1:end] - x[start]
+        ys = y[start + 1:end] - y[start]
+        length = math.hypot(dx, dy)
+        if length:
+            distances = np.abs(dy * xs - dx * ys) / length
+        else:
+            distances = np.hypot(xs, ys)
+        i = int(distances.argmax())
+        return float(distances[i]), start + 1 + i
+
+    kept = [0, n - 1]
+    heap = []  # (-distance, index, start, end) of every segment with points inside
+
+    def push(start, end):
+        if end - start > 1:
+            distance, index = farthest(start, end)
+            heapq.heappush(heap, (-distance, index, start, end))
+
+    push(0, n - 1)
+    while heap and -heap[0][0] > tolerance and len(kept) < max_points:
+        _, index, start, end = heapq.heappop(heap)
+        kept.append(index)
+        push(start, index)
+        push(index, end)
+    return np.sort(kept), (-heap[0][0] if heap else 0.0)
+
+
+def _decimated(x, y):
+    kept, _ = decimate(x, y)
+    return x[kept].tolist(), y[kept].tolist()
+
+
+def headline_metrics(matrices):
+    """
+    Returns the accuracy and macro precision, recall and F1 of a stack of
+    (..., classes, classes) confusion matrices, each as an array of shape (...).
+    """
+    precision, recall, f1 = _class_rates(matrices)
+    correct = np.diagonal(matrices, axis1=-2, axis2=-1).sum(axis=-1)
+    return {
+        "accuracy": correct / np.maximum(matrices.sum(axis=(-2, -1)), 1),
+        "precision": precision.mean(axis=-1),
+        "recall": recall.mean(axis=-1),
+        "f1": f1.mean(axis=-1)
+    }
+
+
+def _bootstrap_job(codes, n_classes, resamples, seed):
+    """
+    Draws `resamples` bootstrap resamples of the (true, predicted) pair codes,
+    in batches of index arrays, and returns their (resamples, classes, classes)
+    confusion matrices.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(codes)
+    cells = n_classes * n_classes
+    matrices = np.empty((resamples, cells), dtype=np.int64)
+    batch = max(1, BOOTSTRAP_BATCH_DRAWS // n)
+    for start in range(0, resamples, batch):
+        rows = min(batch, resamples - start)
+        indices = rng.integers(0, n, size=(rows, n), dtype=np.int32)
+        resampled = codes[indices]
+        # Offsetting each resample's codes by its row lets one bincount count them all
+        resampled += (np.arange(rows, dtype=np.int32) * cells)[:, None]
+        matrices[start:start + rows] = np.bincount(resampled.ravel(), minlength=rows * cells).reshape(rows, cells)
+    return matrices.reshape(resamples, n_classes, n_classes)
+
+
+def bootstrap_intervals(labels, predicted, n_classes, resamples=BOOTSTRAP_RESAMPLES,
+                        confidence=BOOTSTRAP_CONFIDENCE, seed=0, workers=None):
+    """
+    Percentile bootstrap confidence intervals of headline_metrics().
+
+    Args:
+        labels (np.ndarray): (n,) true class indices.
+        predicted (np.ndarray): (n,) predicted class indices.
+        n_classes (int): Number of classes.
+        resamples (int): Bootstrap resamples.
+        confidence (float): Coverage of the intervals.
+        seed (int): Seed of the resampling; the result depends only on it, not on `workers`.
+        workers (int): Processes to spread the resamples over; None resamples in this process.
+
+    Returns:
+        dict: metric -> [low, high].
+    """
+    codes = (np.asarray(labels) * n_classes + np.asarray(predicted)).astype(np.int32)
+    sizes = [min(BOOTSTRAP_JOB_SIZE, resamples - start) for start in range(0, resamples, BOOTSTRAP_JOB_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = ([codes] * len(sizes), [n_classes] * len(sizes), sizes, seeds)
+    if workers:
+        # spawn, not fork: the app calls this from one of the Streamlit server's threads
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            matrices = list(pool.map(_bootstrap_job, *jobs))
+    else:
+        matrices = list(map(_bootstrap_job, *jobs))
+    metrics = headline_metrics(np.concatenate(matrices))
+    tail = (1 - confidence) / 2
+    return {name: np.quantile(metrics[name], [tail, 1 - tail]).tolist() for name in HEADLINE_METRICS}
+
+
+def cached_bootstrap_intervals(path, labels, predicted, n_classes, cache_dir=CACHE_DIR, workers=None):
+    """
+    bootstrap_intervals() with the default settings, read from `cache_dir` if
+    this version of the predictions file was resampled before, and written
+    there otherwise.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    key = f"{digest}-{BOOTSTRAP_RESAMPLES}-{BOOTSTRAP_CONFIDENCE}"
+    cache_path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        pass
+    intervals = bootstrap_intervals(labels, predicted, n_classes, workers=workers)
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump(intervals, f)
+    os.replace(temporary_path, cache_path)
+    return intervals
+
+
+class ThresholdSweep:
+    """
+    Confusion matrices of one class under every decision threshold, for
+    O(log n) lookups while a reader drags a slider.
+
+    A scan is predicted as the class when its score beats the best other class's
+    by more than the threshold, and as that other class otherwise. A margin equal
+    to the threshold goes to whichever of the two comes first, as argmax breaks
+    ties, so a threshold of 0 gives exactly the usual argmax prediction. The
+    margins are sorted once (ties lost by the class first), with cumulative
+    (true class, other class) counts in the same order; the matrix at any
+    threshold is then two binary searches plus O(classes^2) arithmetic.
+
+    Attributes:
+        class_index (int): The class whose threshold moves.
+        margins (np.ndarray): (n,) sorted margins of that class over the best other class.
+    """
+    def __init__(self, labels, scores, class_index):
+        n, n_classes = scores.shape
+        others = scores.copy()
+        others[:, class_index] = -np.inf
+        fallback = others.argmax(axis=1)
+        margins = scores[:, class_index] - others[np.arange(n), fallback]
+        wins_ties = fallback > class_index
+        order = np.lexsort((wins_ties, margins))
+        self.class_index = class_index
+        self.margins = margins[order]
+        self.n_classes = n_classes
+        # loses_ties[i] counts the scans before sorted position i whose ties go to the other class
+        self._loses_ties = np.concatenate(([0], np.cumsum(~wins_ties[order])))
+        # suffix[i] counts the (true, other) pairs of the scans at sorted positions >= i
+        pairs = labels[order] * n_classes + fallback[order]
+        suffix = np.zeros((n + 1, n_classes * n_classes), dtype=np.int32)
+        suffix[np.arange(n), pairs] = 1
+        self._suffix = np.cumsum(suffix[::-1], axis=0, dtype=np.int32)[::-1]
+
+    def confusion(self, threshold):
+        """
+        Returns the confusion matrix, true classes as rows, at `threshold`.
+        """
+        first_tied = int(np.searchsorted(self.margins, threshold, side="left"))
+        past_tied = int(np.searchsorted(self.margins, threshold, side="right"))
+        # Among the margins equal to the threshold, those lost by the class come first
+        first_above = first_tied + int(self._loses_ties[past_tied] - self._loses_ties[first_tied])
+        above = self._suffix[first_above].reshape(self.n_classes, self.n_classes)
+        matrix = self._suffix[0].reshape(self.n_classes, self.n_classes) - above
+        matrix[:, self.class_index] += above.sum(axis=1)
+        return matrix
+
+    def threshold_range(self, coverage=0.99):
+        """
+        Returns (low, high) thresholds spanning the central `coverage` of the
+        margins, rounded outwards to hundredths and widened to include 0.
+        """
+        low, high = np.quantile(self.margins, [(1 - coverage) / 2, (1 + coverage) / 2])
+        return min(math.floor(low * 100) / 100, 0.0), max(math.ceil(high * 100) / 100, 0.0)
+
+
+def evaluate(path, cache_dir=CACHE_DIR, workers=None):
+    """
+    Computes the metrics, confusion matrix and ROC curves of a predictions file.
+    `cache_dir` and `workers` are passed on to cached_bootstrap_intervals().
+
+    Returns:
+        dict: Plain lists and floats, small enough to cache and send as is:
+            classes, accuracy, precision, recall and f1 (macro averages),
+            intervals (their BOOTSTRAP_CONFIDENCE intervals), per_class (precision, recall, f1, support, auc and average
+            precision per class), confusion (rows of counts), and the
+            decimated roc (fpr, tpr) and pr (recall, precision) curves per class.
+    """
+    labels, scores, classes = load_predictions(path)
+    n_classes = len(classes)
+    predicted = scores.argmax(axis=1)
+    matrix = confusion_matrix(labels, predicted, n_classes)
+    per_class = per_class_metrics(matrix)
+    roc = {}
+    pr = {}
+    aucs = []
+    average_precisions = []
+    for k, name in enumerate(classes):
+        points = operating_points(labels == k, scores[:, k])
+        fpr, tpr = roc_curve(*points)
+        # Without both positives and negatives in the test set, the ROC curve is
+        # undefined: its line is still drawn, but the AUC is NaN, as in scikit-learn
+        aucs.append(auc(fpr, tpr) if points[0][-1] and points[1][-1] else math.nan)
+        fpr, tpr = _decimated(fpr, tpr)
+        roc[name] = {"fpr": fpr, "tpr": tpr}
+        recall, precision = pr_curve(*points)
+        average_precisions.append(average_precision(recall, precision))
+        recall, precision = _decimated(recall, precision)
+        pr[name] = {"recall": recall, "precision": precision}
+    return {
+        "classes": classes,
+        "accuracy": float(np.trace(matrix) / max(matrix.sum(), 1)),
+        "precision": float(per_class["precision"].mean()),
+        "recall": float(per_class["recall"].mean()),
+        "f1": float(per_class["f1"].mean()),
+        "intervals": cached_bootstrap_intervals(path, labels, predicted, n_classes, cache_dir, workers),
+        "per_class": {
+            "precision": per_class["precision"].tolist(),
+            "recall": per_class["recall"].tolist(),
+            "f1": per_class["f1"].tolist(),
+            "support": per_class["support"].tolist(),
+            "auc": aucs,
+            "average_precision": average_precisions
+        },
+        "confusion": matrix.tolist(),
+        "roc": roc,
+        "pr": pr
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="predictions files written by export_predictions()")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="bootstrap processes")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"interval cache (default: {CACHE_DIR})")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        result = evaluate(path, args.cache_dir, args.workers)
+        print(path)
+        for name in HEADLINE_METRICS:
+            low, high = result["intervals"][name]
+            print(f"  {name:<10} {result[name]:.4f}  [{low:.4f}, {high:.4f}]")
+
+
+if __name__ == "__main__":
+    main()
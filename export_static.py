@@ -0,0 +1,562 @@
+"""
+Exports the report as a static site that any file server can host.
+
+Runs the display functions of streamlit_app.py once, with `st` swapped for a
+recorder that turns every call into HTML, and writes to site/ (or --output):
+    - index.html: the whole report, with the sidebar navigation and its anchors
+    - img/: the optimized figure variants it references, plus carousel thumbnails
+    - fonts/: the self-hosted fonts of the stylesheet (with --remote-fonts and
+      no fonts to build, the stylesheet imports them from Google Fonts instead)
+    - video/: the local copy of the overview video, when the app has one
+Figures come from optimize_images.py, which is run first for any stale image.
+Carousels become plain client-side carousels, and the video a poster that
+loads the player when clicked, as in the app.
+Evaluations computed from predictions/ become tables of the confusion matrix
+and per-class metrics, in place of the interactive charts.
+
+Needs markdown-it-py, which follows the same CommonMark rules as Streamlit:
+    pip install markdown-it-py
+
+Usage:
+    python export_static.py [--output DIR] [--remote-fonts]
+"""
+import argparse
+import html
+import logging
+import os
+import re
+import shutil
+import sys
+import textwrap
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:
+    sys.exit("export_static.py needs markdown-it-py: pip install markdown-it-py")
+
+logging.disable(logging.WARNING)  # st.cache_* warn when used outside `streamlit run`
+
+import build_styles  # noqa: E402
+import optimize_images  # noqa: E402
+import streamlit_app  # noqa: E402
+
+OUTPUT_DIR = "site"
+# Where the figures are served from, relative to index.html
+IMAGE_URL = "img"
+# Where the local copy of the video is served from, relative to index.html
+VIDEO_URL = "video"
+
+# Page layout, standing in for Streamlit's sidebar and centered content column
+PAGE_CSS = """
+<style>
+    body {
+        margin: 0;
+        display: flex;
+        align-items: flex-start;
+        line-height: 1.6;
+    }
+    a {
+        color: #2B6CB0;
+    }
+    .sidebar {
+        position: sticky;
+        top: 0;
+        flex: 0 0 260px;
+        height: 100vh;
+        overflow-y: auto;
+        box-sizing: border-box;
+        padding: 2rem 1rem;
+        background-color: #F0F2F6;
+        font-size: 14px;
+    }
+    .sidebar p {
+        margin: 0 0 0.5rem;
+    }
+    .sidebar a {
+        color: inherit;
+        text-decoration: none;
+    }
+    main {
+        flex: 1;
+        min-width: 0;
+        max-width: 730px;
+        margin: 0 auto;
+        padding: 3rem 1rem 6rem;
+    }
+    main img {
+        max-width: 100%;
+    }
+    .error {
+        color: #C53030;
+        background-color: #FFF5F5;
+        border-radius: 5px;
+        padding: 12px 16px;
+        margin-bottom: 1rem;
+    }
+    .video-player {
+        position: relative;
+        aspect-ratio: 16 / 9;
+        margin-bottom: 1rem;
+        background: linear-gradient(135deg, #2B6CB0, #1A365D);
+        border-radius: 8px;
+        overflow: hidden;
+    }
+    .video-player img,
+    .video-player iframe,
+    .video-player video {
+        position: absolute;
+        inset: 0;
+        width: 100%;
+        height: 100%;
+        border: 0;
+        object-fit: cover;
+    }
+    .video-player video {
+        object-fit: contain;
+        background: black;
+    }
+    .video-play {
+        position: absolute;
+        inset: 0;
+        width: 100%;
+        border: none;
+        background: none;
+        cursor: pointer;
+    }
+    .video-play span {
+        display: block;
+        width: 72px;
+        height: 72px;
+        margin: auto;
+        border-radius: 50%;
+        background-color: rgba(0, 0, 0, 0.6);
+    }
+    .video-play span::after {
+        content: "";
+        display: block;
+        margin: 22px 0 0 29px;
+        border-style: solid;
+        border-width: 14px 0 14px 22px;
+        border-color: transparent transparent transparent white;
+    }
+    .video-play:hover span {
+        background-color: #2B6CB0;
+    }
+    .carousel-controls {
+        display: flex;
+        justify-content: center;
+        gap: 20px;
+        margin-bottom: 10px;
+    }
+    .carousel-controls button {
+        border: none;
+        border-radius: 5px;
+        padding: 10px 20px;
+        font-size: 16px;
+        cursor: pointer;
+        font-family: 'Poppins', sans-serif;
+        transition: background-color 0.3s ease;
+        background-color: #2B6CB0; /* Blue button */
+        color: white;
+    }
+    .carousel-controls button:hover {
+        background-color: #2C5282; /* Darker blue on hover */
+    }
+    .carousel-strip {
+        display: flex;
+        gap: 8px;
+        overflow-x: auto;
+        padding-bottom: 6px;
+        margin-bottom: 1rem;
+    }
+    .carousel-strip button {
+        flex: 0 0 auto;
+        padding: 0;
+        border: 3px solid transparent;
+        border-radius: 4px;
+        background: none;
+        cursor: pointer;
+    }
+    .carousel-strip button.active {
+        border-color: #2B6CB0;
+    }
+    .carousel-strip img {
+        display: block;
+        height: 60px;
+    }
+    @media (max-width: 768px) {
+        body {
+            display: block;
+        }
+        .sidebar {
+            position: static;
+            height: auto;
+        }
+    }
+</style>
+"""
+
+# Slides other than the current one are hidden and lazy, so they are not
+# fetched until the carousel gets near them
+CAROUSEL_SCRIPT = """
+<script>
+    document.querySelectorAll(".carousel").forEach(function (carousel) {
+        var slides = carousel.querySelectorAll(".carousel-slide");
+        var buttons = carousel.querySelectorAll(".carousel-strip button");
+        var index = 0;
+
+        function select(i) {
+            index = (i + slides.length) % slides.length;
+            slides.forEach(function (slide, j) {
+                slide.hidden = j !== index;
+                // Prefetch both neighbours so Next/Previous swap instantly
+                var distance = (j - index + slides.length) % slides.length;
+                var image = slide.querySelector("img");
+                if (image && (distance <= 1 || distance === slides.length - 1)) {
+                    image.loading = "eager";
+                }
+            });
+            buttons.forEach(function (button, j) {
+                button.classList.toggle("active", j === index);
+            });
+        }
+
+        carousel.querySelector(".carousel-prev").addEventListener("click", function () { select(index - 1); });
+        carousel.querySelector(".carousel-next").addEventListener("click", function () { select(index + 1); });
+        buttons.forEach(function (button, j) {
+            button.addEventListener("click", function () { select(j); });
+        });
+        carousel.addEventListener("keydown", function (event) {
+            if (event.key === "ArrowLeft") { select(index - 1); }
+            if (event.key === "ArrowRight") { select(index + 1); }
+        });
+        select(0);
+    });
+</script>
+"""
+
+# Swaps a video poster for the player on click: the local copy if there is
+# one, YouTube otherwise
+VIDEO_SCRIPT = """
+<script>
+    document.querySelectorAll(".video-player").forEach(function (player) {
+        player.querySelector(".video-play").addEventListener("click", function () {
+            var element;
+            if (player.dataset.file) {
+                element = document.createElement("video");
+                element.src = player.dataset.file;
+                element.controls = true;
+                element.autoplay = true;
+                element.playsInline = true;
+            } else {
+                element = document.createElement("iframe");
+                element.src = "https://www.youtube-nocookie.com/embed/" +
+                    encodeURIComponent(player.dataset.youtube) + "?autoplay=1";
+                element.title = player.dataset.title;
+                element.allow = "accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture";
+                element.allowFullscreen = true;
+            }
+            player.innerHTML = "";
+            player.appendChild(element);
+        });
+    });
+</script>
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+{styles}
+</head>
+<body>
+<nav class="sidebar">
+{sidebar}
+</nav>
+<main>
+{body}
+</main>
+{script}
+</body>
+</html>
+"""
+
+_MARKDOWN = {
+    allow_html: MarkdownIt("commonmark", {"html": allow_html}).enable(["table", "strikethrough"])
+    for allow_html in (False, True)
+}
+
+
+def render_markdown(body, allow_html=False):
+    """
+    Renders markdown the way st.markdown does: dedented and stripped first.
+    """
+    return _MARKDOWN[allow_html].render(textwrap.dedent(str(body)).strip())
+
+
+class StaticPage:
+    """
+    Stands in for the `st` module while the display functions run, collecting
+    the HTML of each call in order and copying the figures it references.
+    """
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.styles = []
+        self.body = []
+        self.sidebar = None
+        self.carousels = 0
+        self.videos = 0
+
+    def html(self, body):
+        body = textwrap.dedent(str(body)).strip()
+        if body.startswith("<style>"):
+            self.styles.append(self._copy_static_urls(body))
+        else:
+            self.body.append(body)
+
+    def _copy_static_urls(self, css):
+        """
+        Copies the files a stylesheet loads from the app's static/ (the fonts) next to
+        index.html, preloads them, and returns the stylesheet pointing to the copies.
+        """
+        def copy(match):
+            file_name = match.group(1)
+            target = os.path.join(self.output_dir, file_name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(build_styles.OUTPUT_DIR, file_name), target)
+            if file_name.endswith(".woff2"):
+                self.styles.append(f'<link rel="preload" href="{html.escape(file_name)}" as="font" '
+                                   'type="font/woff2" crossorigin>')
+            return f"url({file_name})"
+
+        return re.sub(rf"url\({re.escape(build_styles.STATIC_URL)}/([^)]+)\)", copy, css)
+
+    def markdown(self, body, unsafe_allow_html=False):
+        if unsafe_allow_html and textwrap.dedent(body).strip().startswith("<style>"):
+            self.styles.append(textwrap.dedent(body).strip())
+        else:
+            self.body.append(render_markdown(body, unsafe_allow_html))
+
+    def title(self, body):
+        self.body.append(f"<h1>{html.escape(body)}</h1>")
+
+    def error(self, body):
+        self.body.append(f'<div class="error">{html.escape(str(body))}</div>')
+
+    def _copy_variants(self, entry):
+        for variant in entry["variants"]:
+            target = os.path.join(self.output_dir, IMAGE_URL, variant["file"])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(streamlit_app.OPTIMIZED_IMAGE_DIR, variant["file"]), target)
+
+    def _write_thumbnail(self, image_path):
+        entry = streamlit_app.optimized_image_entry(image_path)
+        if entry is not None and "thumbnail" in entry:
+            file_name = entry["thumbnail"]["file"]
+            with open(os.path.join(streamlit_app.OPTIMIZED_IMAGE_DIR, file_name), "rb") as f:
+                data = f.read()
+        else:
+            file_name = "thumbs/" + os.path.splitext(image_path)[0].replace("/", "-") + ".jpg"
+            data = streamlit_app.load_thumbnail(image_path)
+        target = os.path.join(self.output_dir, IMAGE_URL, file_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        return f"{IMAGE_URL}/{file_name}"
+
+    def _figure_html(self, image_path, caption, loading="lazy"):
+        entry = streamlit_app.optimized_image_entry(image_path)
+        if entry is None:
+            return f'<div class="error">{html.escape(f"Error loading image {image_path}: not found")}</div>'
+        self._copy_variants(entry)
+        return streamlit_app.picture_html(entry, caption, base_url=IMAGE_URL, loading=loading)
+
+    def display_image(self, image_path, caption):
+        self.body.append(self._figure_html(image_path, caption))
+
+    def display_evaluation(self, result, key, title=None):
+        if title:
+            self.body.append(f"<p><strong>{html.escape(title)}</strong></p>")
+        classes = result["classes"]
+        confusion = {"True \\ Predicted": classes}
+        for j, predicted_class in enumerate(classes):
+            confusion[predicted_class] = [row[j] for row in result["confusion"]]
+        per_class = result["per_class"]
+        self.body.append(streamlit_app.table_to_html(confusion))
+        self.body.append(streamlit_app.table_to_html({
+            "Class": classes,
+            "Precision": per_class["precision"],
+            "Recall": per_class["recall"],
+            "F1 Score": per_class["f1"],
+            "AUC": per_class["auc"],
+            "Average Precision": per_class["average_precision"],
+            "Support": per_class["support"]
+        }))
+
+    def display_threshold_explorer(self, name, result):
+        pass  # Needs the app to recompute on every slider move
+
+    def display_video(self, youtube_id, poster_path, file_path, file_url, title):
+        self.videos += 1
+        poster = ""
+        entry = streamlit_app.optimized_image_entry(poster_path)
+        if entry is not None:
+            self._copy_variants(entry)
+            image_format = "webp" if any(v["format"] == "webp" for v in entry["variants"]) else "png"
+            variants = sorted((v for v in entry["variants"] if v["format"] == image_format), key=lambda v: v["width"])
+            srcset = ", ".join(f"{IMAGE_URL}/{v['file']} {v['width']}w" for v in variants)
+            poster = (f'<img src="{IMAGE_URL}/{variants[-1]["file"]}" srcset="{srcset}" '
+                      f'sizes="{streamlit_app.FIGURE_SIZES}" alt="" decoding="async">')
+        file_attribute = ""
+        if os.path.exists(file_path):
+            file_name = f"{VIDEO_URL}/{os.path.basename(file_path)}"
+            os.makedirs(os.path.join(self.output_dir, VIDEO_URL), exist_ok=True)
+            shutil.copyfile(file_path, os.path.join(self.output_dir, file_name))
+            file_attribute = f' data-file="{html.escape(file_name)}"'
+        label = html.escape(f"Play {title}")
+        self.body.append(
+            f'<div class="video-player" data-youtube="{html.escape(youtube_id)}" '
+            f'data-title="{html.escape(title)}"{file_attribute}>{poster}'
+            f'<button type="button" class="video-play" title="{label}" aria-label="{label}"><span></span></button></div>'
+        )
+
+    def display_carousel(self, image_paths, state_key):
+        self.carousels += 1
+        slides = []
+        thumbnails = []
+        for i, image_path in enumerate(image_paths):
+            caption = html.escape(os.path.basename(image_path))
+            figure = self._figure_html(image_path, os.path.basename(image_path), loading="eager" if i == 0 else "lazy")
+            slides.append(f'<div class="carousel-slide"{" hidden" if i else ""}>{figure}</div>')
+            try:
+                thumbnail = f'<img src="{self._write_thumbnail(image_path)}" alt="">'
+            except Exception:
+                thumbnail = caption
+            thumbnails.append(f'<button type="button" title="{caption}" aria-label="{caption}">{thumbnail}</button>')
+        self.body.append(
+            f'<div class="carousel" id="{html.escape(state_key)}" tabindex="0">{"".join(slides)}'
+            '<div class="carousel-controls"><button type="button" class="carousel-prev">Previous</button>'
+            '<button type="button" class="carousel-next">Next</button></div>'
+            f'<div class="carousel-strip">{"".join(thumbnails)}</div></div>'
+        )
+
+
+def display_sidebar(page):
+    """
+    Writes the sidebar navigation, one anchor link per "sidebar" entry of the
+    content file, in place of the app's st.navigation.
+    """
+    page.sidebar.title("Navigation")
+    for link in streamlit_app.site_content()["sidebar"]:
+        page.sidebar.markdown("&nbsp;&nbsp;&nbsp;" * link["level"] + f"[{link['label']}](#{link['anchor']})")
+
+
+def display_sections(page):
+    """
+    Writes every section from the video overview to the Gantt chart, under the
+    "Final Findings" and "Results & Discussion" headers the sidebar links to.
+    """
+    streamlit_app.display_video_overview()
+
+    page.markdown('<div class="title" id="final-findings">Final Findings</div>', unsafe_allow_html=True)
+    streamlit_app.display_introduction()
+    streamlit_app.display_problem_definition()
+    streamlit_app.display_methods()
+
+    page.markdown('<div class="section-header" id="results-discussion">Results & Discussion</div>',
+                  unsafe_allow_html=True)
+    streamlit_app.display_cnn_results()
+    streamlit_app.display_logistic_results()
+    streamlit_app.display_svm_results()
+    streamlit_app.display_comparison()
+    streamlit_app.display_next_steps()
+
+    streamlit_app.display_references()
+    streamlit_app.display_gantt_chart()
+
+
+def render_report(page):
+    """
+    Runs the display functions of streamlit_app.py's pages against `page`, on
+    one page with a sidebar of anchor links.
+    """
+    patched = {
+        "st": page,
+        "display_image": page.display_image,
+        "display_carousel": page.display_carousel,
+        "display_video": page.display_video,
+        "display_evaluation": page.display_evaluation,
+        "display_threshold_explorer": page.display_threshold_explorer
+    }
+    originals = {name: getattr(streamlit_app, name) for name in patched}
+    for name, value in patched.items():
+        setattr(streamlit_app, name, value)
+    try:
+        streamlit_app.apply_custom_css()
+        streamlit_app.display_header()
+        display_sidebar(page)
+        streamlit_app.display_team_members()
+        display_sections(page)
+        streamlit_app.display_contributions()
+        streamlit_app.display_gitrepo()
+    finally:
+        for name, value in originals.items():
+            setattr(streamlit_app, name, value)
+
+
+def export(output_dir, remote_fonts=False):
+    """
+    Writes the static site to `output_dir` and returns the path of its index.html.
+    `remote_fonts` is passed on to build_styles.build().
+    """
+    optimize_images.build()
+    build_styles.build(remote_fonts=remote_fonts)
+    # img/, fonts/ and video/ are owned by the export, so files removed from the report do not linger
+    for directory in (IMAGE_URL, "fonts", VIDEO_URL):
+        shutil.rmtree(os.path.join(output_dir, directory), ignore_errors=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    page = StaticPage(output_dir)
+    page.sidebar = StaticPage(output_dir)
+    render_report(page)
+
+    index_path = os.path.join(output_dir, "index.html")
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.format(
+            title="Alzheimer Detection",
+            styles="\n".join(page.styles) + PAGE_CSS,
+            sidebar="\n".join(page.sidebar.body),
+            body="\n".join(page.body),
+            script=(CAROUSEL_SCRIPT if page.carousels else "") + (VIDEO_SCRIPT if page.videos else "")
+        ))
+    return index_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=OUTPUT_DIR, help=f"directory to write the site to (default: {OUTPUT_DIR})")
+    parser.add_argument("--remote-fonts", action="store_true",
+                        help="import Poppins from Google Fonts if the fonts cannot be built")
+    args = parser.parse_args()
+
+    output_dir = os.path.abspath(args.output)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        index_path = export(output_dir, remote_fonts=args.remote_fonts)
+    except build_styles.BuildError as e:
+        sys.exit(f"error: {e}")
+
+    total = 0
+    files = 0
+    for directory, _, file_names in os.walk(output_dir):
+        for file_name in file_names:
+            total += os.path.getsize(os.path.join(directory, file_name))
+            files += 1
+    print(f"wrote {index_path} ({os.path.getsize(index_path) / 1024:.1f}KB) "
+          f"and {files - 1} assets, {total / 1024:.1f}KB in total")
+
+
+if __name__ == "__main__":
+    main()
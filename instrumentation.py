@@ -0,0 +1,175 @@
+"""
+Opt-in timing instrumentation for streamlit_app.py.
+
+Functions decorated with @timed(kind) are timed on every call and aggregated
+into per-process histograms, exposed in the Prometheus text format by
+render_prometheus() (served at /metrics by serve.py). When disabled, which is
+the default, @timed returns the function unchanged and costs nothing.
+
+Environment variables:
+    APP_METRICS=1               enables the instrumentation
+    APP_METRICS_FILE=PATH       also writes the metrics to PATH after reruns, for
+                                node_exporter's textfile collector
+    APP_METRICS_FILE_INTERVAL   minimum seconds between two writes (default: 10)
+    APP_SLOW_RERUN_MS=MS        logs every rerun slower than MS, with its slowest parts
+"""
+import contextlib
+import functools
+import logging
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("APP_METRICS", "").lower() not in ("", "0", "false", "no")
+METRICS_FILE = os.environ.get("APP_METRICS_FILE")
+METRICS_FILE_INTERVAL = float(os.environ.get("APP_METRICS_FILE_INTERVAL", "10"))
+SLOW_RERUN_MS = float(os.environ["APP_SLOW_RERUN_MS"]) if os.environ.get("APP_SLOW_RERUN_MS") else None
+
+METRIC_NAME = "streamlit_app_duration_seconds"
+# Upper bounds of the histogram buckets, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """
+    Counts observations per bucket, plus their sum, like a Prometheus histogram.
+    """
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+
+
+# Process-wide: sessions run their scripts in separate threads
+_lock = threading.Lock()
+_histograms = {}  # (kind, name) -> Histogram
+# The parts timed during the current thread's rerun, for the slow-rerun log
+_current_rerun = threading.local()
+_last_file_write = 0.0
+
+
+def observe(kind, name, seconds):
+    """
+    Records one duration under the histogram for (kind, name).
+    """
+    with _lock:
+        histogram = _histograms.get((kind, name))
+        if histogram is None:
+            histogram = _histograms[(kind, name)] = Histogram()
+        histogram.observe(seconds)
+    parts = getattr(_current_rerun, "parts", None)
+    if parts is not None:
+        parts.append((kind, name, seconds))
+
+
+def timed(kind, name=None):
+    """
+    Decorator that records every call's duration under (kind, name), `name`
+    defaulting to the function's name. Returns the function as is when disabled.
+    """
+    def decorator(function):
+        if not ENABLED:
+            return function
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(kind, label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class _Rerun:
+    def __init__(self, name):
+        self.name = name
+
+
+@contextlib.contextmanager
+def rerun(name="main"):
+    """
+    Times a whole script run as kind "rerun". Set `.name` on the yielded object
+    once the page is known. Afterwards, logs the run if it was slow and refreshes
+    APP_METRICS_FILE.
+    """
+    current = _Rerun(name)
+    if not ENABLED:
+        yield current
+        return
+    _current_rerun.parts = []
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        seconds = time.perf_counter() - start
+        parts = _current_rerun.parts
+        _current_rerun.parts = None
+        observe("rerun", current.name, seconds)
+        if SLOW_RERUN_MS is not None and seconds * 1000 > SLOW_RERUN_MS:
+            slowest = sorted(parts, key=lambda part: -part[2])[:5]
+            logger.warning(
+                "slow rerun of %s: %.1f ms (slowest: %s)", current.name, seconds * 1000,
+                ", ".join(f"{kind} {part_name} {part_seconds * 1000:.1f} ms"
+                          for kind, part_name, part_seconds in slowest)
+            )
+        if METRICS_FILE:
+            write_metrics_file()
+
+
+def render_prometheus():
+    """
+    Returns all histograms in the Prometheus text exposition format.
+    """
+    with _lock:
+        snapshot = [
+            (kind, name, list(histogram.bucket_counts), histogram.count, histogram.sum)
+            for (kind, name), histogram in sorted(_histograms.items())
+        ]
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in instrumented parts of streamlit_app.py.",
+        f"# TYPE {METRIC_NAME} histogram"
+    ]
+    for kind, name, bucket_counts, count, total in snapshot:
+        labels = f'kind="{kind}",name="{_escape_label(name)}"'
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"{METRIC_NAME}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"{METRIC_NAME}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_metrics_file(force=False):
+    """
+    Atomically replaces APP_METRICS_FILE with the current metrics, at most once
+    every APP_METRICS_FILE_INTERVAL seconds unless `force` is set.
+    """
+    global _last_file_write
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _last_file_write < METRICS_FILE_INTERVAL:
+            return
+        _last_file_write = now
+    temporary_path = f"{METRICS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary_path, "w") as f:
+        f.write(render_prometheus())
+    os.replace(temporary_path, METRICS_FILE)
@@ -0,0 +1,78 @@
+"""
+Content-addressed store for the figures the app encodes at runtime.
+
+Figures without optimize_images.py variants used to reach the browser through
+st.image, or inline as data URIs in the carousel, so every session carried its
+own copy of their bytes in the messages sent to it. The store writes each
+encoding once to static/media/<name>.<hash>.<ext> and hands out its URL
+instead: sessions only hold that string, and the file is served like the other
+built assets (with immutable caching under serve.py, since its name is a hash
+of its contents).
+
+Files are named by content, so processes sharing the directory, restarts and
+identical figures all reuse the same file. Nothing is ever deleted while the
+app runs; the directory can be emptied whenever the app is stopped.
+"""
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class MediaStore:
+    """
+    Writes encoded files under `directory` once, and returns their URL under `url`.
+    Thread-safe; counts the files written and the ones found already stored.
+
+    Attributes:
+        directory (str): Where the files are written.
+        url (str): Where the app serves `directory`.
+    """
+    def __init__(self, directory, url):
+        self.directory = directory
+        self.url = url
+        self._lock = threading.Lock()
+        self._stored = set()  # File names known to exist
+        self.writes = 0
+        self.hits = 0
+
+    def put(self, name, data, extension):
+        """
+        Stores `data` as <name>.<hash>.<extension> and returns its URL, or None
+        if the directory cannot be written to.
+        """
+        import optimize_images  # Imports PIL, which app startup avoids
+
+        file_name = optimize_images.fingerprinted_name(name, data, extension)
+        url = f"{self.url}/{file_name}"
+        with self._lock:
+            if file_name in self._stored:
+                self.hits += 1
+                return url
+        path = os.path.join(self.directory, file_name)
+        if not os.path.exists(path):
+            try:
+                self._write(path, data)
+            except OSError as e:
+                logger.warning("could not write %s to the media store: %s", file_name, e)
+                return None
+            with self._lock:
+                self.writes += 1
+        with self._lock:
+            self._stored.add(file_name)
+        return url
+
+    def _write(self, path, data):
+        # Written aside and renamed, so a concurrent request never serves half a file
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(temporary_path, 0o644)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
@@ -0,0 +1,311 @@
+"""
+MRI scan classification with the linear models described in the Methods section.
+
+The notebooks' pipelines are grayscale conversion, flattening to a 1D vector,
+standardization, PCA and a linear classifier (logistic regression or
+LinearSVC). Every step after flattening is affine, so load_model() folds them
+into one float32 weight matrix and bias:
+
+    scores = ((x * pixel_scale - mean) / scale - pca_mean) @ components.T @ coef.T + intercept
+           = x @ weights + bias
+
+which makes classifying a batch of scans a single matrix product. Only NumPy
+and Pillow are needed at runtime; export_model() writes the .npz file from the
+fitted scikit-learn objects in the notebooks.
+
+For many scans at once, collect_scans() lists uploaded images and zip members
+without reading them, and classify_stream() decodes them in a thread pool and
+classifies them in fixed-size chunks, so memory stays flat however many there are.
+Given a prediction_cache.PredictionCache, it skips scans it has seen before.
+"""
+import csv
+import functools
+import hashlib
+import io
+import itertools
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+MODEL_FORMAT_VERSION = 2
+# Folder names of the OASIS dataset, in scikit-learn's sorted label order
+DEFAULT_CLASSES = ["Mild Dementia", "Moderate Dementia", "Non Demented", "Very mild Dementia"]
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# Scans decoded and classified together by classify_stream()
+CHUNK_SIZE = 64
+
+
+class LinearImageClassifier:
+    """
+    A standardization + PCA + linear classifier pipeline folded into one affine map.
+
+    Attributes:
+        weights (np.ndarray): (pixels, classes) float32 matrix.
+        bias (np.ndarray): (classes,) float32 vector.
+        classes (list): Class names, in the order of the score columns.
+        image_size (tuple): (height, width) the scans are resized to.
+        probabilities (str): "softmax" or "ovr" for logistic regression, "none"
+            for an SVM, whose scores are margins rather than probabilities.
+        version (str): Hash of the model file, part of cache keys; None for
+            models not loaded from a file, which are never cached.
+    """
+    def __init__(self, weights, bias, classes, image_size, probabilities, version=None):
+        self.weights = weights
+        self.bias = bias
+        self.classes = classes
+        self.image_size = image_size
+        self.probabilities = probabilities
+        self.version = version
+
+    def preprocess(self, images):
+        """
+        Converts images (PIL images, file paths or encoded bytes) to a
+        (n, pixels) float32 batch: grayscale, resized, flattened row by row.
+        """
+        height, width = self.image_size
+        batch = np.empty((len(images), height * width), dtype=np.float32)
+        for i, image in enumerate(images):
+            self.preprocess_into(image, batch[i])
+        return batch
+
+    def preprocess_into(self, image, row):
+        """
+        Preprocesses one image into `row`, a (pixels,) float32 view of a batch.
+        """
+        height, width = self.image_size
+        if isinstance(image, bytes):
+            image = io.BytesIO(image)
+        if not isinstance(image, Image.Image):
+            image = Image.open(image)
+        image = image.convert("L")
+        if image.size != (width, height):
+            image = image.resize((width, height), Image.BILINEAR)
+        row[:] = np.asarray(image, dtype=np.float32).reshape(-1)
+
+    def decision_function(self, batch):
+        """
+        Returns the (n, classes) scores of a preprocessed batch.
+        """
+        return batch @ self.weights + self.bias
+
+    def predict_scores(self, images):
+        """
+        Returns (n, classes) class probabilities, or SVM margins when the model
+        has no probabilities.
+        """
+        return self.postprocess(self.decision_function(self.preprocess(images)))
+
+    def postprocess(self, scores):
+        """
+        Turns decision_function() scores into what predict_scores() returns.
+        """
+        if self.probabilities == "softmax":
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return scores / scores.sum(axis=1, keepdims=True)
+        if self.probabilities == "ovr":
+            scores = 1 / (1 + np.exp(-scores))
+            return scores / scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, images):
+        """
+        Returns the predicted class name of each image.
+        """
+        scores = self.predict_scores(images)
+        return [self.classes[i] for i in scores.argmax(axis=1)]
+
+
+def collect_scans(files):
+    """
+    Lists the scans in uploaded files without reading them: images as
+    themselves, zip archives member by member.
+
+    Args:
+        files (list): File-like objects with a `name`, e.g. Streamlit uploads.
+
+    Returns:
+        list: (name, read) pairs, where read() returns the encoded image bytes.
+    """
+    scans = []
+    for file in files:
+        name = file.name.lower()
+        if name.endswith(".zip"):
+            archive = zipfile.ZipFile(file)
+            for info in archive.infolist():
+                member = info.filename
+                if (not info.is_dir() and member.lower().endswith(IMAGE_EXTENSIONS)
+                        and not member.startswith("__MACOSX/") and not os.path.basename(member).startswith(".")):
+                    scans.append((f"{file.name}/{member}", functools.partial(archive.read, info)))
+        elif name.endswith(IMAGE_EXTENSIONS):
+            scans.append((file.name, file.getvalue))
+    return scans
+
+
+def classify_stream(model, scans, chunk_size=CHUNK_SIZE, max_workers=None, cache=None):
+    """
+    Classifies scans chunk by chunk, decoding each chunk in a thread pool into
+    one reused (chunk_size, pixels) buffer, so memory does not grow with the
+    number of scans.
+
+    Args:
+        model (LinearImageClassifier): The model to classify with.
+        scans (iterable): (name, read) pairs, as returned by collect_scans().
+        chunk_size (int): Scans decoded and classified together.
+        max_workers (int): Decoder threads; defaults to the CPU count, up to 8.
+        cache (PredictionCache): Where to look up scans by content before
+            decoding them, and to store the new pixels and scores.
+
+    Yields:
+        list: One (name, scores, error) tuple per scan of the chunk, where scores
+        is None and error the message when the scan could not be decoded.
+    """
+    height, width = model.image_size
+    buffer = np.empty((chunk_size, height * width), dtype=np.float32)
+    scans = iter(scans)
+    if model.version is None:
+        cache = None
+    pixels_variant = f"pixels-{height}x{width}"
+    scores_variant = f"scores-{model.version}"
+
+    def decode(row, read):
+        """
+        Fills buffer[row] and returns (digest, cached scores, error).
+        """
+        try:
+            data = read()
+            if cache is None:
+                model.preprocess_into(data, buffer[row])
+                return None, None, None
+            digest = hashlib.sha256(data).hexdigest()
+            scores = cache.get(digest, scores_variant)
+            if scores is not None:
+                return digest, scores, None
+            pixels = cache.get(digest, pixels_variant)
+            if pixels is not None:
+                buffer[row] = pixels
+            else:
+                model.preprocess_into(data, buffer[row])
+                cache.put(digest, pixels_variant, buffer[row].astype(np.uint8))
+            return digest, None, None
+        except UnidentifiedImageError:
+            return None, None, "not a PNG or JPEG image"
+        except Exception as e:
+            return None, None, str(e) or type(e).__name__
+
+    with ThreadPoolExecutor(max_workers or min(8, os.cpu_count() or 1)) as pool:
+        while True:
+            chunk = list(itertools.islice(scans, chunk_size))
+            if not chunk:
+                return
+            decoded = list(pool.map(decode, range(len(chunk)), [read for _, read in chunk]))
+            if all(cached is not None or error for _, cached, error in decoded):
+                scores = None  # Nothing left to classify
+            else:
+                scores = model.postprocess(model.decision_function(buffer[:len(chunk)]))
+            results = []
+            for i, ((name, _), (digest, cached, error)) in enumerate(zip(chunk, decoded)):
+                if error:
+                    results.append((name, None, error))
+                elif cached is not None:
+                    results.append((name, cached, None))
+                else:
+                    if cache is not None:
+                        cache.put(digest, scores_variant, scores[i])
+                    results.append((name, scores[i], None))
+            yield results
+
+
+def predictions_csv(results, classes):
+    """
+    Returns classify_stream() results as CSV text: file, prediction, error and one score column per class.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["file", "prediction", "error"] + list(classes))
+    for name, scores, error in results:
+        if scores is None:
+            writer.writerow([name, "", error] + [""] * len(classes))
+        else:
+            writer.writerow([name, classes[int(scores.argmax())], ""] + [f"{score:.6f}" for score in scores])
+    return output.getvalue()
+
+
+def load_model(path):
+    """
+    Loads an .npz file written by export_model() and folds it into a LinearImageClassifier.
+    The folding runs in float64, and only the result is stored as float32.
+    """
+    with open(path, "rb") as f:
+        contents = f.read()
+    with np.load(io.BytesIO(contents), allow_pickle=False) as data:
+        version = int(data["version"])
+        if version != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format version {version} in {path}")
+        pixel_scale = float(data["pixel_scale"])
+        mean = data["mean"].astype(np.float64)
+        scale = data["scale"].astype(np.float64)
+        components = data["components"].astype(np.float64)
+        pca_mean = data["pca_mean"].astype(np.float64)
+        coef = data["coef"].astype(np.float64)
+        intercept = data["intercept"].astype(np.float64)
+        classes = [str(name) for name in data["classes"]]
+        image_size = tuple(int(n) for n in data["image_size"])
+        probabilities = str(data["probabilities"])
+
+    if coef.shape[0] == 1 and len(classes) == 2:
+        # Binary scikit-learn models keep only the positive class's row, z. As
+        # [-z, z], "ovr" gives scikit-learn's [1 - sigmoid(z), sigmoid(z)], "softmax"
+        # the sigmoid(2z) of an explicitly multinomial model, and an SVM's margin is z
+        coef = np.vstack([-coef, coef])
+        intercept = np.array([-intercept[0], intercept[0]])
+    projection = components.T @ coef.T  # (pixels, classes)
+    weights = projection * (pixel_scale / scale)[:, None]
+    bias = intercept - (mean / scale + pca_mean) @ projection
+    return LinearImageClassifier(
+        weights.astype(np.float32), bias.astype(np.float32), classes, image_size, probabilities,
+        version=hashlib.sha256(contents).hexdigest()[:16]
+    )
+
+
+def export_model(path, scaler, pca, classifier, image_size, pixel_scale=1.0, classes=None):
+    """
+    Writes a fitted pipeline to a compact .npz file for load_model(). Call it
+    from the notebooks with the fitted scikit-learn objects.
+
+    Args:
+        path (str): Output .npz path, e.g. models/logistic_regression.npz.
+        scaler: Fitted StandardScaler (uses mean_ and scale_).
+        pca: Fitted PCA (uses components_ and mean_).
+        classifier: Fitted LogisticRegression or LinearSVC (uses coef_ and intercept_).
+        image_size (tuple): (height, width) the scans were resized to before flattening.
+        pixel_scale (float): Factor applied to 0-255 pixel values before the scaler,
+            e.g. 1 / 255 if the images were normalized to [0, 1].
+        classes (list): Class names; defaults to the classifier's classes_.
+    """
+    if hasattr(classifier, "predict_proba"):
+        # scikit-learn uses one-vs-rest sigmoids for "ovr" and for binary models
+        # (unless explicitly multinomial), softmax otherwise; multi_class was removed in 1.8
+        multi_class = getattr(classifier, "multi_class", "auto")
+        binary = np.shape(classifier.coef_)[0] == 1
+        probabilities = "ovr" if multi_class == "ovr" or (binary and multi_class != "multinomial") else "softmax"
+    else:
+        probabilities = "none"
+    if classes is None:
+        classes = [str(name) for name in getattr(classifier, "classes_", DEFAULT_CLASSES)]
+    np.savez_compressed(
+        path,
+        version=MODEL_FORMAT_VERSION,
+        pixel_scale=pixel_scale,
+        mean=np.asarray(scaler.mean_, dtype=np.float32),
+        scale=np.asarray(scaler.scale_, dtype=np.float32),
+        components=np.asarray(pca.components_, dtype=np.float32),
+        pca_mean=np.asarray(pca.mean_, dtype=np.float32),
+        coef=np.asarray(classifier.coef_, dtype=np.float32),
+        intercept=np.asarray(classifier.intercept_, dtype=np.float32),
+        classes=np.array(classes),
+        image_size=np.array(image_size),
+        probabilities=np.array(probabilities)
+    )
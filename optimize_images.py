@@ -0,0 +1,251 @@
+"""
+Build-time image optimization for the figures shown by streamlit_app.py.
+
+For every PNG in cnn_images/, logistic_images/, svm_images/, comparison_images/
+and the repository root, writes to static/img/:
+    - PNG variants, palette-quantized (or only losslessly recompressed with --lossless)
+    - WebP and AVIF variants
+    - one copy of each format per width in WIDTHS (never upscaled)
+    - a JPEG thumbnail for the carousel strips
+plus static/img/manifest.json, which the app reads to pick the smallest variant
+that fits the viewer. Prints a per-file size report at the end.
+
+Every file name ends in a hash of its contents, e.g. gantt_chart-960w.1f2e3d4c5b.webp,
+so a file never changes once published: serve.py sends them with a one-year
+immutable Cache-Control. Files no longer in the manifest are deleted.
+
+Usage:
+    python optimize_images.py [--force] [--lossless]
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, features
+
+SOURCE_PATTERNS = [
+    "cnn_images/*.png",
+    "logistic_images/*.png",
+    "svm_images/*.png",
+    "comparison_images/*.png",
+    "*.png"
+]
+OUTPUT_DIR = os.path.join("static", "img")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+MANIFEST_VERSION = 2
+# Target widths in pixels: phones, 1x desktop column, 2x desktop column
+WIDTHS = [480, 960, 1460]
+# Bounding box for the carousel thumbnail strip
+THUMBNAIL_SIZE = 160
+# Hex digits of the content hash in each file name
+FINGERPRINT_LENGTH = 10
+
+
+def _encode(image, image_format, lossless):
+    buffer = io.BytesIO()
+    if image_format == "png":
+        if not lossless:
+            # Plots use few colours, so a 256-colour palette is visually identical
+            image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+        image.save(buffer, format="PNG", optimize=True)
+    elif image_format == "webp":
+        if lossless:
+            image.save(buffer, format="WEBP", lossless=True, quality=100, method=4)
+        else:
+            image.save(buffer, format="WEBP", quality=90, method=6)
+    elif image_format == "avif":
+        image.save(buffer, format="AVIF", quality=100 if lossless else 75)
+    return buffer.getvalue()
+
+
+def encode_thumbnail(image):
+    """
+    Returns a small JPEG preview of a PIL image, flattened onto white.
+    """
+    image = image.convert("RGBA")
+    image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+    thumbnail = Image.new("RGB", image.size, "white")
+    thumbnail.paste(image, mask=image.getchannel("A"))
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="JPEG", quality=70, optimize=True)
+    return buffer.getvalue(), thumbnail.size
+
+
+def fingerprinted_name(stem, data, extension):
+    """
+    Returns `stem.<hash of data>.extension`.
+    """
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]}.{extension}"
+
+
+def _write(file_name, data):
+    output_path = os.path.join(OUTPUT_DIR, file_name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(data)
+    return file_name.replace(os.sep, "/")
+
+
+def optimize_image(source_path, lossless=False):
+    """
+    Writes every variant of one source image and returns its manifest entry.
+    """
+    formats = ["png", "webp"] + (["avif"] if features.check("avif") else [])
+    stem, _ = os.path.splitext(source_path)
+    with Image.open(source_path) as image:
+        image.load()
+        source_width, source_height = image.size
+        data, (width, height) = encode_thumbnail(image)
+        thumbnail = {
+            "file": _write(fingerprinted_name(f"{stem}-thumb", data, "jpg"), data),
+            "width": width,
+            "height": height,
+            "bytes": len(data)
+        }
+        # Drop alpha channels that are fully opaque; the figures are all saved as RGBA
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            if image.getchannel("A").getextrema() == (255, 255):
+                image = image.convert("RGB")
+
+        variants = []
+        for width in sorted({min(width, source_width) for width in WIDTHS}):
+            height = round(source_height * width / source_width)
+            resized = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+            for image_format in formats:
+                data = _encode(resized, image_format, lossless)
+                variants.append({
+                    "file": _write(fingerprinted_name(f"{stem}-{width}w", data, image_format), data),
+                    "format": image_format,
+                    "width": width,
+                    "height": height,
+                    "bytes": len(data)
+                })
+
+    stat = os.stat(source_path)
+    return {
+        "width": source_width,
+        "height": source_height,
+        "bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "lossless": lossless,
+        "variants": variants,
+        "thumbnail": thumbnail
+    }
+
+
+def entry_files(entry):
+    """
+    Returns the file names of every variant of an entry, and of its thumbnail.
+    """
+    return [variant["file"] for variant in entry["variants"]] + [entry["thumbnail"]["file"]]
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"version": MANIFEST_VERSION, "images": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "images": {}}
+    return manifest
+
+
+def is_up_to_date(source_path, entry, lossless):
+    """
+    An entry is reused when its source is unchanged and all its files still exist.
+    """
+    if entry is None or entry.get("lossless") != lossless:
+        return False
+    stat = os.stat(source_path)
+    if (stat.st_size, stat.st_mtime_ns) != (entry["bytes"], entry["mtime_ns"]):
+        return False
+    return all(os.path.exists(os.path.join(OUTPUT_DIR, file_name)) for file_name in entry_files(entry))
+
+
+def remove_unreferenced(manifest):
+    """
+    Deletes the files of OUTPUT_DIR that the manifest no longer lists, e.g. the
+    variants of a figure before its last change. Returns how many were deleted.
+    """
+    referenced = {os.path.normpath(file_name) for entry in manifest["images"].values() for file_name in entry_files(entry)}
+    referenced.add(os.path.basename(MANIFEST_PATH))
+    removed = 0
+    for directory, _, file_names in os.walk(OUTPUT_DIR):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            if os.path.relpath(path, OUTPUT_DIR) not in referenced:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def print_report(manifest):
+    """
+    Prints the source size next to the smallest file per format at the largest width.
+    """
+    print(f"{'image':<50} {'source':>9} {'png':>9} {'webp':>9} {'avif':>9} {'saved':>7}")
+    total_source = total_best = 0
+    for source_path, entry in sorted(manifest["images"].items()):
+        largest = max(variant["width"] for variant in entry["variants"])
+        sizes = {variant["format"]: variant["bytes"] for variant in entry["variants"] if variant["width"] == largest}
+        best = min(sizes.values())
+        total_source += entry["bytes"]
+        total_best += best
+        columns = " ".join(f"{sizes[f] / 1024:>7.1f}KB" if f in sizes else f"{'-':>9}" for f in ("png", "webp", "avif"))
+        print(f"{source_path:<50} {entry['bytes'] / 1024:>7.1f}KB {columns} {1 - best / entry['bytes']:>6.0%}")
+    if total_source:
+        print(f"{'total (largest width, best format)':<50} {total_source / 1024:>7.1f}KB "
+              f"{'':>29} {total_best / 1024:>7.1f}KB {1 - total_best / total_source:>6.0%}")
+
+
+def build(force=False, lossless=False):
+    """
+    Optimizes every new or changed source image, writes the manifest and returns it.
+    Paths are relative to the current directory, which must be the repository root.
+    """
+    sources = sorted({path for pattern in SOURCE_PATTERNS for path in glob.glob(pattern)})
+    manifest = load_manifest()
+    images = {}
+    stale = []
+    for source_path in sources:
+        key = source_path.replace(os.sep, "/")
+        entry = manifest["images"].get(key)
+        if not force and is_up_to_date(source_path, entry, lossless):
+            images[key] = entry
+        else:
+            stale.append(source_path)
+
+    with ProcessPoolExecutor() as pool:
+        for source_path, entry in zip(stale, pool.map(optimize_image, stale, [lossless] * len(stale))):
+            images[source_path.replace(os.sep, "/")] = entry
+            print(f"optimized {source_path}", file=sys.stderr)
+
+    manifest = {"version": MANIFEST_VERSION, "images": images}
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    removed = remove_unreferenced(manifest)
+    if removed:
+        print(f"removed {removed} outdated files", file=sys.stderr)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="rebuild every image, even unchanged ones")
+    parser.add_argument("--lossless", action="store_true", help="skip palette quantization and lossy WebP/AVIF")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    print_report(build(force=args.force, lossless=args.lossless))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Two-tier cache of classifier results, keyed by the content of the uploaded scan.
+
+Entries are small NumPy arrays stored under (digest, variant), where digest is
+the hex SHA-256 of the encoded image bytes and variant says what was computed:
+    - "pixels-<height>x<width>": the preprocessed scan, as uint8, shared by every
+      model with that input size
+    - "scores-<model version>": a model's scores for the scan
+The memory tier is an LRU shared by every session in the process; the disk
+tier keeps entries across restarts as .npy files, least recently used first
+out. Both tiers are bounded in bytes. Hits and misses are counted per kind of
+variant (the part before the first "-"), so a scan whose scores miss and whose
+pixels hit shows up as one of each, not as two lookups of the same thing.
+"""
+import collections
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionCache:
+    """
+    A memory LRU in front of an optional disk directory, both bounded in bytes.
+    Thread-safe; counts hits per tier and misses, per kind of variant.
+
+    Attributes:
+        memory_limit (int): Bytes of arrays kept in memory.
+        disk_dir (str): Directory of the disk tier, or None for memory only.
+        disk_limit (int): Bytes of .npy files kept in disk_dir.
+    """
+    def __init__(self, memory_limit, disk_dir=None, disk_limit=0):
+        self.memory_limit = memory_limit
+        self.disk_dir = disk_dir
+        self.disk_limit = disk_limit
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()  # key -> array, least recently used first
+        self._memory_bytes = 0
+        self._disk = None  # path -> size, least recently used first; read on first use
+        self._disk_bytes = 0
+        self._counts = {}  # kind of variant -> {"memory_hits", "disk_hits", "misses"}
+
+    def get(self, digest, variant):
+        """
+        Returns the cached array for (digest, variant), or None.
+        """
+        key = (digest, variant)
+        with self._lock:
+            array = self._memory.get(key)
+            if array is not None:
+                self._memory.move_to_end(key)
+                self._count(variant, "memory_hits")
+                return array
+        array = self._read_disk(key)
+        with self._lock:
+            if array is None:
+                self._count(variant, "misses")
+                return None
+            self._count(variant, "disk_hits")
+            self._remember(key, array)
+        return array
+
+    def put(self, digest, variant, array):
+        """
+        Stores a copy of `array` under (digest, variant) in both tiers.
+        """
+        key = (digest, variant)
+        array = np.array(array)
+        array.flags.writeable = False  # Shared between sessions
+        with self._lock:
+            self._remember(key, array)
+        try:
+            self._write_disk(key, array)
+        except OSError as e:
+            # A full or read-only disk only costs the persistence
+            logger.warning("could not write %s to the prediction cache: %s", key, e)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters, as {kind of variant: {"memory_hits",
+        "disk_hits", "misses"}} under "lookups", and the bytes held by each tier.
+        """
+        with self._lock:
+            return {
+                "lookups": {kind: dict(counts) for kind, counts in self._counts.items()},
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes
+            }
+
+    def _count(self, variant, outcome):
+        """
+        Counts a lookup of `variant`. Called with the lock held.
+        """
+        kind = variant.split("-", 1)[0]
+        counts = self._counts.setdefault(kind, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    def _remember(self, key, array):
+        if array.nbytes > self.memory_limit:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.nbytes
+        self._memory[key] = array
+        self._memory_bytes += array.nbytes
+        while self._memory_bytes > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _path(self, key):
+        digest, variant = key
+        return os.path.join(self.disk_dir, digest[:2], f"{digest}.{variant}.npy")
+
+    def _load_disk_index(self):
+        """
+        Lists the disk tier once, oldest modification first. Called with the lock held.
+        """
+        if self._disk is not None:
+            return
+        entries = []
+        for directory, _, file_names in os.walk(self.disk_dir):
+            for file_name in file_names:
+                if file_name.endswith(".npy"):
+                    path = os.path.join(directory, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, path, stat.st_size))
+        self._disk = collections.OrderedDict((path, size) for _, path, size in sorted(entries))
+        self._disk_bytes = sum(self._disk.values())
+
+    def _read_disk(self, key):
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        with self._lock:
+            self._load_disk_index()
+            if path not in self._disk:
+                return None
+            self._disk.move_to_end(path)
+        try:
+            array = np.load(path, allow_pickle=False)
+            os.utime(path)  # Keeps the file's LRU position across restarts
+        except (OSError, ValueError):
+            # Evicted by another process, or a partial file: drop it
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(path, 0)
+            return None
+        array.flags.writeable = False
+        return array
+
+    def _write_disk(self, key, array):
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(temporary_path, path)
+        size = os.path.getsize(path)
+        evicted = []
+        with self._lock:
+            self._load_disk_index()
+            self._disk_bytes += size - self._disk.pop(path, 0)
+            self._disk[path] = size
+            while self._disk_bytes > self.disk_limit and self._disk:
+                evicted_path, evicted_size = self._disk.popitem(last=False)
+                self._disk_bytes -= evicted_size
+                evicted.append(evicted_path)
+        for evicted_path in evicted:
+            try:
+                os.remove(evicted_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,129 @@
+"""
+Report content kept out of the code: content.json lists the team, the pages
+and sidebar links, the hard-coded metric tables, the figures of the sections
+(by name, in "figures") and of the carousels, and the contributions of each
+stage of the project. asset_registry.py checks the same figures at startup.
+
+load_content() parses and validates the file and returns it as a plain dict,
+which streamlit_app.py caches once per process by modification time: editing
+content.json updates every session on its next rerun, without a restart. A
+file that fails validation raises ValueError naming the offending entry.
+"""
+import json
+
+CONTENT_FORMAT_VERSION = 2
+CONTRIBUTION_STAGES = ["final", "midpoint", "proposal"]
+# Figures shown by name in the sections of streamlit_app.py
+FIGURES = ["video_poster", "cnn_metrics", "grad_cam1", "grad_cam2", "logistic_metrics", "svm_metrics",
+           "leakage_investigation", "gantt_chart"]
+CAROUSELS = ["cnn", "logistic", "svm"]
+METRIC_TABLES = ["cnn", "logistic", "svm"]
+
+
+def _check(condition, path, message):
+    if not condition:
+        raise ValueError(f"{path}: {message}")
+
+
+def _check_strings(value, path, where):
+    _check(isinstance(value, list) and value and all(isinstance(item, str) and item for item in value),
+           path, f"{where} must be a non-empty list of strings")
+
+
+def _check_records(records, path, where, fields):
+    """
+    Checks that `records` is a non-empty list of objects with exactly `fields`,
+    given as {name: type}.
+    """
+    _check(isinstance(records, list) and records, path, f"{where} must be a non-empty list")
+    for i, record in enumerate(records):
+        _check(isinstance(record, dict) and set(record) == set(fields), path,
+               f"{where}[{i}] must have exactly the fields {', '.join(fields)}")
+        for name, kind in fields.items():
+            _check(isinstance(record[name], kind) and not isinstance(record[name], bool), path,
+                   f"{where}[{i}].{name} must be of type {kind.__name__}")
+
+
+def validate_content(content, path="content.json", section_paths=None):
+    """
+    Raises ValueError if `content` does not have the layout described in the
+    module docstring.
+
+    Args:
+        content (dict): The parsed file.
+        path (str): File name used in error messages.
+        section_paths (iterable): URL paths that have a display function; every
+            page in "sections" must use one of them. Not checked when None.
+    """
+    _check(isinstance(content, dict), path, "must contain a JSON object")
+    version = content.get("version")
+    _check(version == CONTENT_FORMAT_VERSION, path, f"unsupported content format version {version}")
+
+    _check_records(content.get("team"), path, "team", {"name": str, "link": str})
+    names = [member["name"] for member in content["team"]]
+    _check(len(set(names)) == len(names), path, "team names must be unique")
+
+    _check_records(content.get("sections"), path, "sections", {"group": str, "title": str, "path": str})
+    paths = [section["path"] for section in content["sections"]]
+    _check(len(set(paths)) == len(paths), path, "section paths must be unique")
+    if section_paths is not None:
+        unknown = sorted(set(paths) - set(section_paths))
+        _check(not unknown, path, f"sections without a display function: {', '.join(unknown)}")
+
+    _check_records(content.get("sidebar"), path, "sidebar", {"label": str, "anchor": str, "level": int})
+
+    metrics = content.get("metrics")
+    _check(isinstance(metrics, dict) and set(metrics) == set(METRIC_TABLES), path,
+           f"metrics must have exactly the tables {', '.join(METRIC_TABLES)}")
+    for name, table in metrics.items():
+        where = f"metrics.{name}"
+        _check(isinstance(table, dict) and "Metric" in table, path, f"{where} must be an object with a Metric column")
+        _check_strings(table["Metric"], path, f"{where}.Metric")
+        for column, values in table.items():
+            if column == "Metric":
+                continue
+            _check(isinstance(values, list) and len(values) == len(table["Metric"])
+                   and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values),
+                   path, f"{where}.{column} must list one number per metric")
+
+    figures = content.get("figures")
+    _check(isinstance(figures, dict) and set(figures) == set(FIGURES), path,
+           f"figures must have exactly the names {', '.join(FIGURES)}")
+    for name, figure in figures.items():
+        _check(isinstance(figure, str) and figure, path, f"figures.{name} must be a non-empty string")
+
+    carousels = content.get("carousels")
+    _check(isinstance(carousels, dict) and set(carousels) == set(CAROUSELS), path,
+           f"carousels must have exactly the figure lists {', '.join(CAROUSELS)}")
+    for name, figures in carousels.items():
+        _check_strings(figures, path, f"carousels.{name}")
+
+    contributions = content.get("contributions")
+    _check(isinstance(contributions, dict) and set(contributions) == set(CONTRIBUTION_STAGES), path,
+           f"contributions must have exactly the stages {', '.join(CONTRIBUTION_STAGES)}")
+    for stage, members in contributions.items():
+        _check(isinstance(members, dict), path, f"contributions.{stage} must map team member names to lists")
+        unknown = sorted(set(members) - set(names))
+        _check(not unknown, path, f"contributions.{stage} names people not in team: {', '.join(unknown)}")
+        for name, items in members.items():
+            _check_strings(items, path, f"contributions.{stage}.{name}")
+
+
+def load_content(path, section_paths=None):
+    """
+    Reads and validates a content file.
+
+    Args:
+        path (str): Path of the JSON file, e.g. content.json.
+        section_paths (iterable): Passed on to validate_content().
+
+    Returns:
+        dict: The parsed content, shared between sessions: treat it as read-only.
+    """
+    with open(path, encoding="utf-8") as f:
+        try:
+            content = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}") from None
+    validate_content(content, path, section_paths)
+    return content
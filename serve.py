@@ -0,0 +1,135 @@
+"""
+Launches streamlit_app.py with extra HTTP routes next to Streamlit's own:
+    /metrics    Prometheus metrics from instrumentation.py, when APP_METRICS is set
+    /ready      readiness check: 503 until asset_registry.py has checked the
+                figures and warmed up their caches, then 200; both with its
+                status() as JSON
+    /app/static/<file>
+                the figures, stylesheet and fonts built by optimize_images.py
+                and build_styles.py, in place of Streamlit's static serving.
+                Their names carry a hash of their contents, so they are sent
+                with a one-year immutable Cache-Control: browsers and CDNs
+                never ask for them again.
+                The local copy of the overview video is served there too,
+                with range requests, so playback and seeking start at once.
+The asset registry starts with the server, before it accepts connections: with
+APP_STRICT_ASSETS=1, a missing figure stops the server from starting.
+Every HTML page also gets Link headers that preload the self-hosted fonts, so
+browsers fetch them alongside Streamlit's scripts rather than after the first rerun.
+
+Usage:
+    APP_METRICS=1 streamlit run serve.py
+    APP_METRICS=1 python serve.py
+"""
+import contextlib
+import functools
+import json
+import os
+import re
+
+import streamlit as st
+from starlette.datastructures import MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+import asset_registry
+import build_styles
+import instrumentation
+import optimize_images
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(REPO_ROOT, build_styles.OUTPUT_DIR)
+STYLE_MANIFEST_PATH = os.path.join(REPO_ROOT, build_styles.MANIFEST_PATH)
+FINGERPRINTED_NAME = re.compile(rf"\.[0-9a-f]{{{optimize_images.FINGERPRINT_LENGTH}}}\.\w+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+async def metrics(request):
+    if not instrumentation.ENABLED:
+        return Response("Set APP_METRICS=1 to collect metrics.\n", status_code=404, media_type="text/plain")
+    return PlainTextResponse(instrumentation.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def ready(request):
+    status = asset_registry.status()
+    return JSONResponse(status, status_code=200 if status["state"] == "ready" else 503,
+                        headers={"Cache-Control": "no-store"})
+
+
+async def static_file(request):
+    root = os.path.realpath(STATIC_DIR)
+    path = os.path.realpath(os.path.join(root, request.path_params["file"]))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise HTTPException(status_code=404)
+    # Anything without a fingerprint (the manifests) may change in place
+    cache_control = IMMUTABLE if FINGERPRINTED_NAME.search(path) else "no-cache"
+    return FileResponse(path, headers={
+        "Cache-Control": cache_control,
+        "Access-Control-Allow-Origin": "*",
+        "X-Content-Type-Options": "nosniff"
+    })
+
+
+@functools.lru_cache(maxsize=1)
+def _preload_links(mtime):
+    with open(STYLE_MANIFEST_PATH) as f:
+        fonts = json.load(f)["fonts"].values()
+    return [f'<{build_styles.STATIC_URL}/{font}>; rel=preload; as=font; type="font/woff2"; crossorigin'
+            for font in fonts]
+
+
+def preload_links():
+    """
+    Returns the Link header values preloading the fonts of the built stylesheet,
+    re-read when build_styles.py writes a new one.
+    """
+    try:
+        return _preload_links(os.stat(STYLE_MANIFEST_PATH).st_mtime_ns)
+    except FileNotFoundError:
+        return []
+
+
+class PreloadFonts:
+    """
+    ASGI middleware adding preload_links() to every HTML response.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_links(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-type", "").startswith("text/html"):
+                    for link in preload_links():
+                        headers.append("Link", link)
+            await send(message)
+
+        await self.app(scope, receive, send_with_links)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    asset_registry.start()
+    yield
+
+
+app = st.App(
+    "streamlit_app.py",
+    lifespan=lifespan,
+    routes=[
+        Route("/metrics", metrics),
+        Route("/ready", ready),
+        Route("/app/static/{file:path}", static_file)
+    ],
+    middleware=[Middleware(PreloadFonts)]
+)
+
+if __name__ == "__main__":
+    app.run()
@@ -1,183 +1,801 @@
 import streamlit as st
-import pandas as pd
-from PIL import Image  # Importing Image from PIL
+import streamlit.components.v1 as components
+import asset_registry
+import build_styles
+import instrumentation
+import report_content
+# PIL is imported where it is used, and pandas not at all: together they add
+# ~0.5s to a cold start, and most pages need neither (see benchmarks/import_time.py)
+import base64
+import functools
+import html
+import io
+import json
+import logging
+import math
+import numbers
 import os  # Importing os for file path handling
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Team, pages, metric tables, carousel figures and contributions (see report_content.py)
+CONTENT_PATH = "content.json"
+# A number as DataFrame.to_html writes floats before trimming their zeros
+FIXED_POINT = re.compile(r"^-?[0-9]+\.[0-9]*$")
+# Upper bound on distinct (path, mtime) entries kept in the shared image cache
+IMAGE_CACHE_MAX_ENTRIES = 64
+# Built assets, served at app/static/ by Streamlit, or by serve.py with
+# immutable caching (their names are content hashes)
+STATIC_DIR = "static"
+# Stylesheet and its Poppins fonts, from build_styles.py
+STYLE_SOURCE_PATH = os.path.join("styles", "app.css")
+STYLE_MANIFEST_PATH = os.path.join(STATIC_DIR, "css", "manifest.json")
+# Figure variants written by optimize_images.py
+OPTIMIZED_IMAGE_DIR = os.path.join(STATIC_DIR, "img")
+OPTIMIZED_IMAGE_URL = "app/static/img"
+IMAGE_MANIFEST_PATH = os.path.join(OPTIMIZED_IMAGE_DIR, "manifest.json")
+# Rendered width of a figure: the full viewport on phones, the content column otherwise
+FIGURE_SIZES = "(max-width: 736px) 100vw, 704px"
+# Video Overview: a poster frame (figures.video_poster in content.json) stands in
+# for the player until it is clicked. The poster is optimized like any root PNG;
+# a local MP4, if present, is played in place of YouTube (for networks without
+# internet access)
+VIDEO_YOUTUBE_ID = "u_W8FndaQbk"
+VIDEO_FILE_PATH = os.path.join(STATIC_DIR, "video", "overview.mp4")
+VIDEO_FILE_URL = "app/static/video/overview.mp4"
+
+# Models exported from the notebooks with mri_classifier.export_model()
+CLASSIFIER_MODELS = {
+    "Logistic Regression": os.path.join("models", "logistic_regression.npz"),
+    "SVM": os.path.join("models", "linear_svc.npz")
+}
+# Classifier results by scan content (see prediction_cache.py): the memory tier
+# is shared by all sessions, the disk tier survives restarts
+PREDICTION_CACHE_DIR = os.path.join(".cache", "predictions")
+PREDICTION_CACHE_MEMORY_BYTES = 64 * 1024 * 1024
+PREDICTION_CACHE_DISK_BYTES = 512 * 1024 * 1024
+# Test-set predictions exported from the notebooks with evaluation.export_predictions().
+# Sections whose files exist compute their metrics and charts from them instead
+# of showing the hard-coded values and static figures.
+PREDICTION_FILES = {
+    "cnn": os.path.join("predictions", "cnn.npz"),
+    "logistic_before": os.path.join("predictions", "logistic_before.npz"),
+    "logistic_after": os.path.join("predictions", "logistic_after.npz"),
+    "svm": os.path.join("predictions", "svm.npz")
+}
+# The PREDICTION_FILES whose charts stand in for each carousel's figures (see carousel_figures())
+CAROUSEL_PREDICTIONS = {
+    "cnn": ["cnn"],
+    "logistic": ["logistic_before", "logistic_after"],
+    "svm": ["svm"]
+}
+
+# Carousel frontend (plain HTML/JS, served by Streamlit as a custom component)
+_carousel_component = components.declare_component(
+    "carousel",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "carousel")
+)
+# Click-to-load video player
+_video_component = components.declare_component(
+    "video",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "video")
+)
+
+
+# ---------------------------
+# Report Content
+# ---------------------------
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_content(path, mtime):
+    """
+    Parses and validates the content file once per modification time, for all
+    sessions. Returns None, after logging why, if the file fails validation.
+    """
+    try:
+        return report_content.load_content(path, section_paths=SECTION_DISPLAYS)
+    except ValueError as e:
+        logger.warning("ignoring invalid %s: %s", path, e)
+        return None
+
+@st.cache_resource(show_spinner=False)
+def _last_valid_content():
+    return {}
+
+def site_content():
+    """
+    Returns the contents of CONTENT_PATH (see report_content.py). Every rerun
+    only checks the file's modification time, so an edit shows up on the next
+    rerun of each session. If the edited file is invalid, the last valid
+    version keeps being served.
+    """
+    last_valid = _last_valid_content()
+    try:
+        content = _load_content(CONTENT_PATH, os.stat(CONTENT_PATH).st_mtime_ns)
+    except FileNotFoundError:
+        content = None
+    if content is None:
+        if "content" not in last_valid:
+            # Nothing to fall back on: fail with the actual error
+            return report_content.load_content(CONTENT_PATH, section_paths=SECTION_DISPLAYS)
+        return last_valid["content"]
+    last_valid["content"] = content
+    return content
 
 
 # ---------------------------
 # Helper Functions
 # ---------------------------
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _read_style_manifest(mtime):
+    with open(STYLE_MANIFEST_PATH) as f:
+        return json.load(f)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _style_html(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
+
+def _style_manifest():
+    try:
+        return _read_style_manifest(os.stat(STYLE_MANIFEST_PATH).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
 def apply_custom_css():
-    css = """
-    <style>
-    /* Import 'Poppins' font from Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@400;600&display=swap');
-
-    /* Common Styles */
-    body {
-        font-family: 'Poppins', sans-serif;
-        background-color: #F5F7FA; /* Light neutral background */
-        color: #2D3748; /* Dark slate text */
-    }
-    .title {
-        font-size: 48px;
-        text-align: center;
-        margin-bottom: 10px;
-        font-weight: 600;
-    }
-    .subtitle {
-        font-size: 24px;
-        text-align: center;
-        margin-bottom: 30px;
-        font-weight: 400;
-    }
-    .names-list {
-        font-size: 20px;
-        list-style-type: none;
-        padding: 0;
-        text-align: center;
-        margin-bottom: 40px;
-    }
-    .names-list span {
-        padding: 5px 15px; /* Add padding for better spacing */
-        font-weight: 500;
-    }
-    .title {
-        font-size: 40px; /* Increased font size for main sections */
-        text-align: center;
-        margin-top: 40px;
-        margin-bottom: 20px;
-        border-bottom: 3px solid #2B6CB0; /* Blue for section headers */
-        padding-bottom: 10px;
-        font-weight: 600;
-        color: #2B6CB0;
-    }
-    .section-header {
-        font-size: 28px;
-        margin-top: 0px;
-        font-weight: 500;
-        color: #2B6CB0; 
-    }
-    .subsection-header {
-        font-size: 20px;
-        margin-top: 0px;
-        font-weight: 400;
-        color: #2B6CB0; 
-    }
-    .contribution-table {
-        width: 100%;
-        border-collapse: collapse;
-        margin-top: 20px;
-        font-family: 'Poppins', sans-serif;
-    }
-    .contribution-table th, .contribution-table td {
-        border: 1px solid #CBD5E0; /* Light border color */
-        text-align: left;
-        padding: 12px;
-    }
-    .contribution-table th {
-        background-color: #2B6CB0; /* Blue header */
-        color: white;
-        font-weight: 600;
-    }
-    .contribution-table tr:nth-child(even) {
-        background-color: #EDF2F7; /* Light gray for even rows */
-    }
-    .footer {
-        text-align: center;
-        margin-top: 50px;
-        font-size: 14px;
-        color: #A0AEC0;
-    }
-    .stButton button {
-        border: none;
-        border-radius: 5px;
-        padding: 10px 20px;
-        font-size: 16px;
-        cursor: pointer;
-        font-family: 'Poppins', sans-serif;
-        transition: background-color 0.3s ease;
-        background-color: #2B6CB0; /* Blue button */
-        color: white;
-    }
-    .stButton button:hover {
-        background-color: #2C5282; /* Darker blue on hover */
-    }
-    .streamlit-expanderHeader {
-        font-size: 20px;
-        font-weight: bold;
-        color: #2B6CB0; /* Blue for headers */
+    """
+    Injects the stylesheet minified by build_styles.py, or its source when it has
+    not been built. The file is read once per process. Holding only a <style>,
+    the st.html takes no space on the page, and the browser caches it (see
+    global.minCachedMessageSize in .streamlit/config.toml): after the first run
+    of a session, reruns only send its hash.
+    """
+    manifest = _style_manifest()
+    path = STYLE_SOURCE_PATH if manifest is None else os.path.join(STATIC_DIR, manifest["stylesheet"])
+    st.html(_style_html(path, os.stat(path).st_mtime_ns))
+
+def component_fonts():
+    """
+    Returns the fonts for the frames of the custom components, which do not see
+    the app's stylesheet: the self-hosted Poppins faces of build_styles.py, by
+    URL relative to the app, or the Google Fonts stylesheet if the build was
+    passed --remote-fonts. Unbuilt, the frames use the system's fonts, as the page does.
+    """
+    manifest = _style_manifest()
+    if manifest is None or not manifest["fonts"]:
+        return {"faces": [], "stylesheet": None if manifest is None else manifest.get("remote_fonts")}
+    return {
+        "faces": [{"weight": int(weight), "url": f"{build_styles.STATIC_URL}/{file_name}"}
+                  for weight, file_name in sorted(manifest["fonts"].items())],
+        "stylesheet": None
     }
-    /* Carousel Button Styles */
-    .carousel-button {
-        background-color: #2B6CB0; /* Blue background */
-        color: white; /* White text */
-        border: none;
-        border-radius: 50px; /* Rounded buttons */
-        padding: 10px 20px;
-        font-size: 16px;
-        cursor: pointer;
-        margin: 10px; /* Space between buttons */
-        transition: background-color 0.3s ease;
+
+# ---------------------------
+# Table Rendering
+# ---------------------------
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+def _trim_zeros(texts):
+    """
+    Strips the trailing zeros all the fixed-point numbers share, keeping one decimal.
+    """
+    numbers = [i for i, text in enumerate(texts) if FIXED_POINT.match(text)]
+    if not numbers:
+        return texts
+    trailing_zeros = min(len(texts[i]) - len(texts[i].rstrip("0")) for i in numbers)
+    trimmed = list(texts)
+    for i in numbers:
+        text = texts[i][:len(texts[i]) - trailing_zeros]
+        trimmed[i] = text + "0" if text.endswith(".") else text
+    return trimmed
+
+def _format_floats(values):
+    """
+    Formats a float column as pandas does: six decimals, minus the trailing
+    zeros they all share, or scientific notation if a value would round to
+    zero or a large one makes the column too wide. Missing values are NaN.
+    """
+    def formatted(spec):
+        return ["NaN" if _is_missing(value) else format(float(value), spec) for value in values]
+
+    texts = _trim_zeros(formatted(".6f"))
+    present = [abs(float(value)) for value in values if not _is_missing(value)]
+    too_long = max(len(text) for text in texts) > 12
+    if any(0 < value < 1e-6 for value in present) or (too_long and any(value > 1e6 for value in present)):
+        return formatted(".6e")
+    return texts
+
+def _format_column(values):
+    """
+    Formats a column the way pandas' DataFrame.to_html does, for the types the
+    report's tables hold: numbers, strings, and None or NaN for missing values.
+    """
+    if not values:
+        return []
+    if all(value is None for value in values):
+        return ["None"] * len(values)
+    if all(_is_missing(value) or (isinstance(value, numbers.Real) and not isinstance(value, bool))
+           for value in values):
+        if all(isinstance(value, numbers.Integral) for value in values):
+            return [str(value) for value in values]
+        # Mixed ints and floats, or any missing value, make a float column
+        return _format_floats(values)
+    if all(isinstance(value, str) or _is_missing(value) for value in values):
+        # A string column, whose missing values pandas shows as NaN
+        return ["NaN" if _is_missing(value) else value for value in values]
+    # An object column: each value on its own
+    return ["None" if value is None else "NaN" if _is_missing(value)
+            else _trim_zeros([f"{value:.6f}"])[0] if isinstance(value, float) else str(value)
+            for value in values]
+
+@instrumentation.timed("table")
+def table_to_html(data):
+    """
+    Renders a dict of columns as a styled HTML table, with the same markup as
+    pandas' DataFrame.to_html(index=False, escape=False) but without importing
+    pandas. It is cheaper than an st.cache_data lookup, so it is not cached.
+    """
+    columns = [_format_column(values) for values in data.values()]
+    header = "".join(f"      <th>{name}</th>\n" for name in data)
+    rows = "".join(
+        "    <tr>\n" + "".join(f"      <td>{cell}</td>\n" for cell in row) + "    </tr>\n"
+        for row in zip(*columns)
+    )
+    return (
+        '<table border="1" class="dataframe contribution-table">\n'
+        f'  <thead>\n    <tr style="text-align: right;">\n{header}    </tr>\n  </thead>\n'
+        f'  <tbody>\n{rows}  </tbody>\n</table>'
+    )
+
+# ---------------------------
+# Image Cache
+# ---------------------------
+@st.cache_resource(max_entries=IMAGE_CACHE_MAX_ENTRIES, show_spinner=False)
+def _encode_image(image_path, mtime):
+    """
+    Decodes an image once per (path, mtime). The cache is shared by every session in the process.
+    """
+    return asset_registry.encode_png(image_path)
+
+@st.cache_resource(max_entries=IMAGE_CACHE_MAX_ENTRIES, show_spinner=False)
+def _encode_thumbnail(image_path, mtime):
+    return asset_registry.encode_thumbnail(image_path)
+
+def _image_mtime(image_path):
+    try:
+        return os.stat(image_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Image not found at path: {image_path}") from None
+
+@instrumentation.timed("image")
+def load_image(image_path):
+    """
+    Returns the cached, already-encoded bytes for an image file.
+    Editing the file changes its mtime, which invalidates the cached entry.
+    """
+    return _encode_image(image_path, _image_mtime(image_path))
+
+@instrumentation.timed("image")
+def load_thumbnail(image_path):
+    """
+    Returns the cached JPEG thumbnail for an image file.
+    """
+    return _encode_thumbnail(image_path, _image_mtime(image_path))
+
+@instrumentation.timed("image")
+def stored_image(image_path, thumbnail=False):
+    """
+    Returns {"url", "width", "height"} of an image in the media store ({"url"}
+    only for its thumbnail), or None if the store cannot be written to.
+    Every session gets the same URL, so the bytes exist once per process, and
+    the figures the report references are already stored by the startup warm-up
+    (see asset_registry.py).
+    """
+    return asset_registry.stored_image(image_path, _image_mtime(image_path), thumbnail)
+
+def to_data_uri(data, mimetype):
+    return f"data:{mimetype};base64,{base64.b64encode(data).decode('ascii')}"
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _read_image_manifest(mtime):
+    with open(IMAGE_MANIFEST_PATH) as f:
+        return json.load(f)["images"]
+
+def optimized_image_entry(image_path):
+    """
+    Returns the optimize_images.py manifest entry for an image, or None if the
+    pipeline has not been run or the source changed after the last build.
+    """
+    try:
+        manifest = _read_image_manifest(os.stat(IMAGE_MANIFEST_PATH).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+    entry = manifest.get(image_path)
+    if entry is None:
+        return None
+    try:
+        if os.stat(image_path).st_mtime_ns != entry["mtime_ns"]:
+            return None
+    except FileNotFoundError:
+        pass  # Deployed with the optimized variants only
+    return entry
+
+def optimized_variant(entry, width, formats=("png", "webp")):
+    """
+    Returns the smallest variant of a manifest entry at least `width` pixels
+    wide, or the widest one if none is.
+    """
+    candidates = [variant for variant in entry["variants"] if variant["format"] in formats]
+    fitting = [variant["width"] for variant in candidates if variant["width"] >= width]
+    target_width = min(fitting) if fitting else max(variant["width"] for variant in candidates)
+    return min((v for v in candidates if v["width"] == target_width), key=lambda v: v["bytes"])
+
+def picture_html(entry, caption, base_url=OPTIMIZED_IMAGE_URL, loading="lazy"):
+    """
+    Builds a <picture> element that lets the browser fetch the smallest variant
+    for its viewport width and pixel density. `base_url` is where the variant
+    files are served from, and `loading` is passed on to the <img>.
+    """
+    variants_by_format = {}
+    for variant in sorted(entry["variants"], key=lambda v: v["width"]):
+        variants_by_format.setdefault(variant["format"], []).append(variant)
+
+    def srcset(variants):
+        return ", ".join(f"{base_url}/{v['file']} {v['width']}w" for v in variants)
+
+    # Browsers take the first <source> whose type they support, so list the
+    # formats that beat the PNG fallback, smallest first
+    png_bytes = sum(v["bytes"] for v in variants_by_format["png"])
+    smaller_formats = sorted(
+        (f for f, variants in variants_by_format.items() if sum(v["bytes"] for v in variants) < png_bytes),
+        key=lambda f: sum(v["bytes"] for v in variants_by_format[f])
+    )
+    sources = "".join(
+        f'<source type="image/{f}" srcset="{srcset(variants_by_format[f])}" sizes="{FIGURE_SIZES}">'
+        for f in smaller_formats
+    )
+    fallback = variants_by_format["png"][-1]
+    caption = html.escape(caption)
+    return (
+        f'<figure class="figure"><picture>{sources}'
+        f'<img src="{base_url}/{fallback["file"]}" srcset="{srcset(variants_by_format["png"])}" '
+        f'sizes="{FIGURE_SIZES}" width="{fallback["width"]}" height="{fallback["height"]}" '
+        f'alt="{caption}" loading="{loading}" decoding="async">'
+        f'</picture><figcaption>{caption}</figcaption></figure>'
+    )
+
+def stored_figure_html(stored, caption):
+    """
+    Builds the same figure as picture_html() for an image of the media store.
+    """
+    caption = html.escape(caption)
+    return (
+        f'<figure class="figure"><img src="{stored["url"]}" width="{stored["width"]}" '
+        f'height="{stored["height"]}" alt="{caption}" loading="lazy" decoding="async">'
+        f'<figcaption>{caption}</figcaption></figure>'
+    )
+
+@instrumentation.timed("image")
+def display_image(image_path, caption):
+    """
+    Displays an image, preferring the optimized variants from optimize_images.py,
+    then the original encoded into the media store. Falls back to st.image if the
+    store cannot be written to, or an error message if the image cannot be loaded.
+    """
+    entry = optimized_image_entry(image_path)
+    if entry is not None:
+        st.markdown(picture_html(entry, caption), unsafe_allow_html=True)
+        return
+    try:
+        stored = stored_image(image_path)
+        if stored is not None:
+            st.markdown(stored_figure_html(stored, caption), unsafe_allow_html=True)
+        else:
+            st.image(load_image(image_path), caption=caption, output_format="PNG", width="stretch")
+    except Exception as e:
+        st.error(f"Error loading image {image_path}: {e}")
+
+# --------------------
+# Model Evaluation
+# --------------------
+@st.cache_data(max_entries=len(PREDICTION_FILES), show_spinner=False)
+def _evaluate(path, mtime):
+    import evaluation  # Brings in NumPy, which only the results pages need
+
+    return evaluation.evaluate(path)
+
+def live_evaluation(name):
+    """
+    Returns evaluation.evaluate() for a PREDICTION_FILES entry, cached per file
+    version, or None if the file has not been exported.
+    """
+    path = PREDICTION_FILES[name]
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _evaluate(path, mtime)
+
+def carousel_figures(carousels, name):
+    """
+    Returns the figures a carousel of content.json shows, given its "carousels":
+    once its CAROUSEL_PREDICTIONS are exported, the CNN carousel leaves out the
+    ROC figure the computed chart replaces, and the other two are not shown (None).
+    """
+    if not all(os.path.exists(PREDICTION_FILES[prediction]) for prediction in CAROUSEL_PREDICTIONS[name]):
+        return carousels[name]
+    if name == "cnn":
+        return [figure for figure in carousels[name] if figure != "cnn_images/roc_per_class.png"]
+    return None
+
+def metrics_table(columns):
+    """
+    Builds the performance metrics table from evaluations, one value column and
+    one 95% bootstrap confidence interval column per (column name, evaluation)
+    in `columns`.
+    """
+    metrics = ["accuracy", "precision", "recall", "f1"]
+    table = {"Metric": ["Accuracy", "Precision", "Recall", "F1 Score"]}
+    for column, result in columns.items():
+        table[column] = [result[metric] for metric in metrics]
+        table["95% CI" + column.removeprefix("Value")] = [
+            "{:.4f} to {:.4f}".format(*result["intervals"][metric]) for metric in metrics
+        ]
+    return table
+
+# Axes of the curves in evaluation.evaluate() results: (curve, x field, x title, y field, y title, summary, summary label)
+CURVES = {
+    "ROC": ("roc", "fpr", "False Positive Rate", "tpr", "True Positive Rate", "auc", "AUC"),
+    "Precision-Recall": ("pr", "recall", "Recall", "precision", "Precision", "average_precision", "AP")
+}
+
+def curve_chart_spec(result, kind):
+    """
+    Vega-Lite spec of the one-vs-rest curves of a CURVES kind, with each class's
+    AUC or average precision in the legend.
+    """
+    curve, x, x_title, y, y_title, summary, summary_label = CURVES[kind]
+    values = []
+    for name, value in zip(result["classes"], result["per_class"][summary]):
+        points = result[curve][name]
+        label = f"{name} ({summary_label} {'n/a' if math.isnan(value) else f'{value:.3f}'})"
+        values.extend({"class": label, "point": i, "x": x_value, "y": y_value}
+                      for i, (x_value, y_value) in enumerate(zip(points[x], points[y])))
+    return {
+        "data": {"values": values},
+        "mark": {"type": "line", "clip": True},
+        "encoding": {
+            "x": {"field": "x", "type": "quantitative", "title": x_title, "scale": {"domain": [0, 1]}},
+            "y": {"field": "y", "type": "quantitative", "title": y_title, "scale": {"domain": [0, 1]}},
+            "color": {"field": "class", "type": "nominal", "title": None, "legend": {"orient": "bottom", "columns": 2}},
+            "order": {"field": "point", "type": "quantitative"}
+        }
     }
 
-    .carousel-button:hover {
-        background-color: #2C5282; /* Darker blue on hover */
+def confusion_chart_spec(result):
+    """
+    Vega-Lite spec of the confusion matrix as a heatmap whose cells can be selected.
+    """
+    classes = result["classes"]
+    values = []
+    for true_class, row in zip(classes, result["confusion"]):
+        total = sum(row)
+        for predicted_class, count in zip(classes, row):
+            values.append({"true": true_class, "predicted": predicted_class, "count": count,
+                           "share": count / total if total else 0})
+    axis = {"type": "nominal", "sort": classes, "axis": {"labelAngle": 0, "labelLimit": 90}}
+    return {
+        "data": {"values": values},
+        "encoding": {
+            "x": {"field": "predicted", "title": "Predicted", **axis},
+            "y": {"field": "true", "title": "True", **axis}
+        },
+        "layer": [
+            {
+                "params": [{"name": "cell", "select": {"type": "point", "fields": ["true", "predicted"]}}],
+                "mark": {"type": "rect", "cursor": "pointer"},
+                "encoding": {
+                    "color": {"field": "share", "type": "quantitative", "title": "Share of row",
+                              "scale": {"scheme": "blues", "domain": [0, 1]}},
+                    "opacity": {"condition": {"param": "cell", "empty": True, "value": 1}, "value": 0.4},
+                    "tooltip": [{"field": "true", "title": "True"}, {"field": "predicted", "title": "Predicted"},
+                                {"field": "count", "title": "Scans"},
+                                {"field": "share", "title": "Share of row", "format": ".1%"}]
+                }
+            },
+            {
+                "mark": {"type": "text"},
+                "encoding": {
+                    "text": {"field": "count", "type": "quantitative"},
+                    "color": {"condition": {"test": "datum.share > 0.5", "value": "white"}, "value": "black"}
+                }
+            }
+        ]
     }
-    </style>
+
+def display_confusion_breakdown(result, true_class, predicted_class):
+    """
+    Shows what a confusion matrix cell means, and the metrics of its two classes.
+    """
+    classes = result["classes"]
+    i, j = classes.index(true_class), classes.index(predicted_class)
+    count = result["confusion"][i][j]
+    support = result["per_class"]["support"][i]
+    share = count / support if support else 0
+    st.markdown(f"**{count}** of the {support} *{true_class}* scans ({share:.1%}) were classified as *{predicted_class}*.")
+    rows = sorted({i, j})
+    per_class = result["per_class"]
+    st.markdown(table_to_html({
+        "Class": [classes[k] for k in rows],
+        "Precision": [per_class["precision"][k] for k in rows],
+        "Recall": [per_class["recall"][k] for k in rows],
+        "F1 Score": [per_class["f1"][k] for k in rows],
+        "AUC": [per_class["auc"][k] for k in rows],
+        "Average Precision": [per_class["average_precision"][k] for k in rows],
+        "Support": [per_class["support"][k] for k in rows]
+    }), unsafe_allow_html=True)
+
+@st.fragment
+@instrumentation.timed("section")
+def display_evaluation(result, key, title=None):
+    """
+    Displays the ROC and precision-recall curves and the confusion matrix of an
+    evaluation as interactive charts. Clicking a confusion matrix cell shows its per-class breakdown; as a
+    fragment, that only reruns these charts.
+
+    Args:
+        result (dict): Returned by live_evaluation().
+        key (str): Widget key prefix, unique per evaluation.
+        title (str): Optional heading above the charts.
+    """
+    if title:
+        st.markdown(f"**{title}**")
+    curves_column, confusion_column = st.columns(2)
+    with curves_column:
+        for tab, kind in zip(st.tabs(list(CURVES)), CURVES):
+            with tab:
+                st.vega_lite_chart(curve_chart_spec(result, kind), width="stretch")
+    with confusion_column:
+        event = st.vega_lite_chart(confusion_chart_spec(result), width="stretch", on_select="rerun",
+                                   selection_mode="cell", key=f"{key}_confusion")
+    cells = event["selection"].get("cell") or []
+    if cells:
+        display_confusion_breakdown(result, cells[0]["true"], cells[0]["predicted"])
+    else:
+        st.caption("Click a cell of the confusion matrix for its per-class breakdown.")
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _threshold_sweep(path, mtime, class_index):
+    """
+    Precomputes one class's evaluation.ThresholdSweep (~5MB for 80,000 scans),
+    shared by every session.
+    """
+    import evaluation
+
+    labels, scores, _ = evaluation.load_predictions(path)
+    return evaluation.ThresholdSweep(labels, scores, class_index)
+
+@st.fragment
+@instrumentation.timed("section")
+def display_threshold_explorer(name, result):
     """
-    st.markdown(css, unsafe_allow_html=True)
+    Lets readers move one class's decision threshold and see the confusion
+    matrix, precision and recall change. Each move is a binary search in a
+    sweep precomputed once per class, and reruns only this fragment.
+
+    Args:
+        name (str): The PREDICTION_FILES entry `result` was computed from.
+        result (dict): Returned by live_evaluation().
+    """
+    import evaluation
+
+    classes = result["classes"]
+    st.markdown("**Decision Threshold Explorer:**", unsafe_allow_html=True)
+    # Start on the class the model recalls worst, where thresholds matter most
+    worst = min(range(len(classes)), key=lambda k: result["per_class"]["recall"][k])
+    class_name = st.selectbox("Class", classes, index=worst, key=f"{name}_threshold_class")
+    class_index = classes.index(class_name)
+    path = PREDICTION_FILES[name]
+    sweep = _threshold_sweep(path, os.stat(path).st_mtime_ns, class_index)
+    low, high = sweep.threshold_range()
+    threshold = st.slider(
+        f"Score margin needed to predict {class_name}", low, high, 0.0, step=(high - low) / 200 or 0.01,
+        key=f"{name}_threshold_{class_index}",
+        help=f"A scan is predicted as {class_name} when its score beats the next most likely class's by more "
+             "than this much. At 0 every scan gets its most likely class, ties going to the first listed."
+    )
+    matrix = sweep.confusion(threshold)
+    metrics = evaluation.per_class_metrics(matrix)
+    baseline = evaluation.per_class_metrics(sweep.confusion(0.0))
+    st.markdown(table_to_html({
+        "Class": classes,
+        "Precision": metrics["precision"].tolist(),
+        "Recall": metrics["recall"].tolist(),
+        "Precision at 0": baseline["precision"].tolist(),
+        "Recall at 0": baseline["recall"].tolist()
+    }), unsafe_allow_html=True)
+    st.vega_lite_chart(confusion_chart_spec({"classes": classes, "confusion": matrix.tolist()}), width="stretch")
 
 # --------------------
 # Display Functions
 # --------------------
-def list_cnn_images():
-    image_dir = "cnn_images"
-    st.markdown("### **Debugging: List of Images in `cnn_images` Directory**")
-    
-    if not os.path.exists(image_dir):
-        st.error(f"The directory `{image_dir}` does not exist.")
-        return
-    
-    files = os.listdir(image_dir)
-    image_files = [file for file in files if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))]
-    
-    if not image_files:
-        st.warning(f"No image files found in `{image_dir}`.")
-    else:
-        st.write("**Available Images:**")
-        for img in image_files:
-            st.write(f"- {img}")
-
 # Header Section 
+@instrumentation.timed("section")
 def display_header():
     st.markdown('<div class="title">Alzheimer Detection</div>', unsafe_allow_html=True)
 
 # Team Members Section 
-def display_team_members(names, links):
+@instrumentation.timed("section")
+def display_team_members():
     """
-        names (list): List of team member names.
-        links (list): List of URLs corresponding to each team member.
+    Displays the team members of the content file, each linked to their profile.
     """
     st.markdown("### <a id='team-members'></a>**Team Members**", unsafe_allow_html=True)
     st.markdown(
         "<div class='names-list'>" +
-        " ".join([f"<span><a href='{link}' target='_blank'>{name}</a></span>" for name, link in zip(names, links)]) +
+        " ".join([f"<span><a href='{member['link']}' target='_blank'>{member['name']}</a></span>"
+                  for member in site_content()["team"]]) +
         "</div>",
         unsafe_allow_html=True
     )
 
-# Project Proposal Section 
-def display_project_proposal():
+# Carousel Section
+def _carousel_query_param(state_key):
+    """
+    Returns the query parameter naming a carousel's current figure, e.g.
+    "logistic_carousel" for "logistic_carousel_index".
+    """
+    return state_key.removesuffix("_index")
+
+def _figure_name(image_path):
+    return os.path.splitext(os.path.basename(image_path))[0]
+
+def _sync_carousel_index(state_key, image_paths):
+    """
+    Copies the slide picked in the carousel frontend into the carousel's index.
+    """
+    st.session_state[state_key] = st.session_state[f"{state_key}_carousel"]["index"] % len(image_paths)
+
+def _sync_carousel_query_param(state_key, image_paths, index):
+    """
+    Mirrors a carousel's figure into the URL, so a reload on any replica (or a
+    shared link) shows the same figure. The first figure is the default and
+    leaves the URL clean. Called on every run of the carousel: Streamlit drops
+    the query parameters of the previous page when the visitor switches pages,
+    so coming back must name the figure again.
+    """
+    param = _carousel_query_param(state_key)
+    name = _figure_name(image_paths[index]) if index else None
+    if st.query_params.get(param) != name:
+        if name is None:
+            del st.query_params[param]
+        else:
+            st.query_params[param] = name
+
+@st.fragment
+@instrumentation.timed("section")
+def display_carousel(image_paths, state_key):
+    """
+    Displays a carousel of figures as a fragment, so navigating it never reruns the report.
+
+    The frontend gets a thumbnail strip once, plus the full-resolution images sized
+    to the width it reports. Figures built by optimize_images.py are sent as URLs of
+    their fingerprinted files, all at once, and the browser caches the files
+    themselves. Others are encoded into the media store, only for the current
+    slide and its neighbours, and sent as URLs too (inline if the store cannot be
+    written to). Next/Previous then swap images client-side, and each click only
+    fetches the one new neighbour the page does not have yet.
+
+    The current figure is mirrored into the URL (see _sync_carousel_query_param()),
+    which a new session starts from.
+
+    Args:
+        image_paths (list): Paths of the figures to show, in order.
+        state_key (str): Session state key holding the current slide index.
+    """
+    if state_key not in st.session_state:
+        names = [_figure_name(image_path) for image_path in image_paths]
+        requested = st.query_params.get(_carousel_query_param(state_key))
+        st.session_state[state_key] = names.index(requested) if requested in names else 0
+
+    total_images = len(image_paths)
+    index = st.session_state[state_key] % total_images
+    _sync_carousel_query_param(state_key, image_paths, index)
+    # What the frontend already holds, as last reported by it
+    client = st.session_state.get(f"{state_key}_carousel") or {}
+    have = set(client.get("have", []))
+    send_thumbnails = not client.get("thumbnails")
+    # Full images wait until the frontend has reported its width in device pixels
+    width = client.get("width")
+
+    slides = []
+    images = {}
+    for i, image_path in enumerate(image_paths):
+        slide = {"caption": os.path.basename(image_path)}
+        entry = optimized_image_entry(image_path)
+        try:
+            if send_thumbnails:
+                if entry is not None and "thumbnail" in entry:
+                    slide["thumbnail"] = f"{OPTIMIZED_IMAGE_URL}/{entry['thumbnail']['file']}"
+                else:
+                    stored = stored_image(image_path, thumbnail=True)
+                    slide["thumbnail"] = (stored["url"] if stored is not None
+                                          else to_data_uri(load_thumbnail(image_path), "image/jpeg"))
+            if width and i not in have:
+                if entry is not None:
+                    images[i] = f"{OPTIMIZED_IMAGE_URL}/{optimized_variant(entry, width)['file']}"
+                elif (i - index) % total_images in (0, 1, total_images - 1):
+                    stored = stored_image(image_path)
+                    images[i] = stored["url"] if stored is not None else to_data_uri(load_image(image_path), "image/png")
+        except Exception as e:
+            slide["error"] = f"Error loading image {image_path}: {e}"
+        slides.append(slide)
+
+    _carousel_component(
+        slides=slides,
+        images=images,
+        index=index,
+        fonts=component_fonts(),
+        key=f"{state_key}_carousel",
+        on_change=functools.partial(_sync_carousel_index, state_key, image_paths)
+    )
+    if "error" in slides[index]:
+        st.error(slides[index]["error"])
+
+# Video Overview Section
+def display_video(youtube_id, poster_path, file_path, file_url, title):
+    """
+    Displays a poster frame with a play button that loads the player only when
+    clicked, so the page fetches no third-party script until someone watches.
+
+    Args:
+        youtube_id (str): ID of the video on YouTube, embedded from youtube-nocookie.com.
+        poster_path (str): Source image of the poster. Shown through its
+            optimize_images.py variants, or else from the media store; if it
+            cannot be loaded, the player is a plain panel.
+        file_path (str): Local copy of the video, played instead of YouTube if it exists.
+        file_url (str): URL the app serves `file_path` at.
+        title (str): Accessible name of the player.
+    """
+    poster = None
+    entry = optimized_image_entry(poster_path)
+    if entry is not None:
+        # WebP beats PNG for a photo-like frame, and every supported browser decodes it
+        image_format = "webp" if any(v["format"] == "webp" for v in entry["variants"]) else "png"
+        variants = sorted((v for v in entry["variants"] if v["format"] == image_format), key=lambda v: v["width"])
+        poster = {
+            "src": f"{OPTIMIZED_IMAGE_URL}/{variants[-1]['file']}",
+            "srcset": [{"src": f"{OPTIMIZED_IMAGE_URL}/{v['file']}", "width": v["width"]} for v in variants]
+        }
+    else:
+        try:
+            stored = stored_image(poster_path)
+            if stored is not None:
+                poster = {"src": stored["url"], "srcset": []}
+        except Exception as e:
+            logger.warning("showing the video without its poster: %s", e)
+    _video_component(
+        youtube=youtube_id,
+        poster=poster,
+        file=file_url if os.path.exists(file_path) else None,
+        title=title,
+        fonts=component_fonts(),
+        key=f"video_{youtube_id}",
+        default=None
+    )
+
+@instrumentation.timed("section")
+def display_video_overview():
     st.markdown('<div class="title" id="project-proposal">Video Overview</div>', unsafe_allow_html=True)
     
     # Project Overview Video
-    st.video("https://www.youtube.com/watch?v=u_W8FndaQbk") 
-
-    # Final Findings
-    st.markdown('<div class="title" id="final-findings">Final Findings</div>', unsafe_allow_html=True)
+    display_video(VIDEO_YOUTUBE_ID, site_content()["figures"]["video_poster"], VIDEO_FILE_PATH, VIDEO_FILE_URL, "Project Overview")
 
-    # Introduction & Background
+# Introduction & Background Section
+@instrumentation.timed("section")
+def display_introduction():
     st.markdown('<div class="section-header" id="introduction">Introduction & Background</div>', unsafe_allow_html=True)
     st.markdown(
         """
@@ -188,7 +806,9 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    # Problem Definition
+# Problem Definition Section
+@instrumentation.timed("section")
+def display_problem_definition():
     st.markdown('<div class="section-header" id="problem-definition">Problem Definition</div>', unsafe_allow_html=True)
     st.markdown(
         "**The Problem**<br>"
@@ -200,7 +820,9 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    # Methods
+# Methods Section
+@instrumentation.timed("section")
+def display_methods():
     st.markdown('<div class="section-header" id="methods">Methods</div>', unsafe_allow_html=True)
     st.markdown(
         """
@@ -273,10 +895,9 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    # Results & Discussion Section 
-    st.markdown('<div class="section-header" id="results-discussion">Results & Discussion</div>', unsafe_allow_html=True)
-
-    # CNN Results & Discussion Subsection
+# CNN Results & Discussion Section
+@instrumentation.timed("section")
+def display_cnn_results():
     st.markdown('<div class="subsection-header" id="cnn-results-discussion">CNN Results & Discussion</div>', unsafe_allow_html=True)
 
     st.markdown(
@@ -288,27 +909,13 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    try:
-        image_path = "cnn_images/cnn_performance_metrics.png"  # Ensure the folder is named 'cnn_images'
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found at path: {image_path}")
-        image = Image.open(image_path)
-        st.image(image, caption='CNN Performance Metrics', use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {image_path}: {e}")
-
-    # Create a table with metrics and values
-    cnn_metrics = {
-        "Metric": ["Accuracy", "Precision", "Recall", "F1 Score"],
-        "Value": [0.9997108322248569, 0.9996747459096856, 0.9995429616087752, 0.9996085761354763]
-    }
-    df_cnn_metrics = pd.DataFrame(cnn_metrics)
-
-    def table_to_html(df):
-        return df.to_html(index=False, classes='contribution-table', escape=False)
+    cnn = live_evaluation("cnn")
+    if cnn is None:
+        display_image(site_content()["figures"]["cnn_metrics"], caption='CNN Performance Metrics')
 
     st.markdown("**Performance Metrics:**", unsafe_allow_html=True)
-    st.markdown(table_to_html(df_cnn_metrics), unsafe_allow_html=True)
+    st.markdown(table_to_html(site_content()["metrics"]["cnn"] if cnn is None else metrics_table({"Value": cnn})),
+                unsafe_allow_html=True)
 
     # Explanations for each metric
     st.markdown(
@@ -323,8 +930,6 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    # Debugging: List images
-    # list_cnn_images()
     st.markdown("**GradCam:**", unsafe_allow_html=True)
     st.markdown(
         """
@@ -332,23 +937,9 @@ def display_project_proposal():
         """,
         unsafe_allow_html=True
     )
-    try:
-        image_path = "cnn_images/grad_cam1.png"  # Ensure the folder is named 'cnn_images'
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found at path: {image_path}")
-        image = Image.open(image_path)
-        st.image(image, caption='GradCam Example 1', use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {image_path}: {e}")
+    display_image(site_content()["figures"]["grad_cam1"], caption='GradCam Example 1')
 
-    try:
-        image_path = "cnn_images/grad_cam2.png"  # Ensure the folder is named 'cnn_images'
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found at path: {image_path}")
-        image = Image.open(image_path)
-        st.image(image, caption='GradCam Example 2', use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {image_path}: {e}")
+    display_image(site_content()["figures"]["grad_cam2"], caption='GradCam Example 2')
 
     st.markdown(
         """
@@ -358,45 +949,9 @@ def display_project_proposal():
     )
     st.markdown("**Additional Visualizations:**", unsafe_allow_html=True)
 
-    carousel_images = [
-        "cnn_images/roc_per_class.png",
-        "cnn_images/prob_mild.png",
-        "cnn_images/prob_mod.png",
-        "cnn_images/prob_non.png",
-        "cnn_images/prob_verymild.png",
-        "cnn_images/learning_loss_curve.png"
-    ]
-
-    if 'carousel_index' not in st.session_state:
-        st.session_state.carousel_index = 0
-
-    total_images = len(carousel_images)
-
-    # Display the current image
-    current_image_path = carousel_images[st.session_state.carousel_index]
-    try:
-        if not os.path.exists(current_image_path):
-            raise FileNotFoundError(f"Image not found at path: {current_image_path}")
-        current_image = Image.open(current_image_path)
-        st.image(current_image, caption=os.path.basename(current_image_path), use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {current_image_path}: {e}")
-
-    # Create three columns: empty, buttons, empty for centering
-    button_col1, button_col2, button_col3 = st.columns([1, 2, 1])
-
-    with button_col1:
-        pass  # Empty column for spacing
-
-    with button_col2:
-        # Previous Button
-        if st.button("Previous", key="prev_button"):
-            st.session_state.carousel_index = (st.session_state.carousel_index - 1) % total_images
-
-    with button_col3:
-        # Next Button
-        if st.button("Next", key="next_button"):
-            st.session_state.carousel_index = (st.session_state.carousel_index + 1) % total_images
+    if cnn is not None:
+        display_evaluation(cnn, "cnn")
+    display_carousel(carousel_figures(site_content()["carousels"], "cnn"), state_key="carousel_index")
 
     # Concluding paragraph
     st.markdown(
@@ -409,7 +964,9 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    # Logistic Regression Results & Discussion Subsection
+# Logistic Regression Results & Discussion Section
+@instrumentation.timed("section")
+def display_logistic_results():
     st.markdown('<div class="subsection-header" id="logistic-results-discussion">Logistic Regression Results & Discussion</div>', unsafe_allow_html=True)
     st.markdown(
         """
@@ -419,28 +976,16 @@ def display_project_proposal():
         unsafe_allow_html=True
     )
 
-    try:
-        image_path = "logistic_images/logistic_performance_metrics.png"  # Ensure the folder is named 'cnn_images'
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found at path: {image_path}")
-        image = Image.open(image_path)
-        st.image(image, caption='Logistic Regression Performance Metrics', use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {image_path}: {e}")
-
-    # Create a table with metrics and values
-    logistic_metrics = {
-        "Metric": ["Accuracy", "Precision", "Recall", "F1 Score"],
-        "Value Before": [0.9243, 0.9217, 0.9013, 0.9114],
-        "Value After": [0.9044, 0.9328, 0.9347, 0.9337]
-    }
-    df_logistic_metrics = pd.DataFrame(logistic_metrics)
-
-    def table_to_html(df):
-        return df.to_html(index=False, classes='contribution-table', escape=False)
+    before = live_evaluation("logistic_before")
+    after = live_evaluation("logistic_after")
+    live = before is not None and after is not None
+    if not live:
+        display_image(site_content()["figures"]["logistic_metrics"], caption='Logistic Regression Performance Metrics')
 
     st.markdown("**Performance Metrics:**", unsafe_allow_html=True)
-    st.markdown(table_to_html(df_logistic_metrics), unsafe_allow_html=True)
+    st.markdown(table_to_html(metrics_table({"Value Before": before, "Value After": after}) if live
+                              else site_content()["metrics"]["logistic"]),
+                unsafe_allow_html=True)
 
     # Explanations for each metric
     st.markdown(
@@ -457,46 +1002,13 @@ def display_project_proposal():
 
     st.markdown("**Additional Visualizations:**", unsafe_allow_html=True)
 
-    # Define logistic regression carousel images
-    logistic_carousel_images = [
-        "logistic_images/log_roc_before.png",
-        "logistic_images/log_confusion_before.png",
-        "logistic_images/log_roc_after.png",
-        "logistic_images/log_confusion_after.png"
-    ]
-
-    # Initialize session state for logistic carousel if not already set
-    if 'logistic_carousel_index' not in st.session_state:
-        st.session_state.logistic_carousel_index = 0
-
-    logistic_total_images = len(logistic_carousel_images)
-
-    # Display the current logistic regression image
-    current_logistic_image_path = logistic_carousel_images[st.session_state.logistic_carousel_index]
-    try:
-        if not os.path.exists(current_logistic_image_path):
-            raise FileNotFoundError(f"Image not found at path: {current_logistic_image_path}")
-        current_logistic_image = Image.open(current_logistic_image_path)
-        st.image(current_logistic_image, caption=os.path.basename(current_logistic_image_path), use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {current_logistic_image_path}: {e}")
-
-    # Create three columns for navigation buttons (Previous, Spacer, Next)
-    logistic_button_col1, logistic_button_col2, logistic_button_col3 = st.columns([1, 2, 1])
-
-    with logistic_button_col1:
-        pass  # Empty column for spacing
-
-    with logistic_button_col2:
-        # Previous Button
-        if st.button("Previous (Logistic)", key="log_prev_button"):
-            st.session_state.logistic_carousel_index = (st.session_state.logistic_carousel_index - 1) % logistic_total_images
+    if live:
+        display_evaluation(before, "logistic_before", title="Before balancing")
+        display_evaluation(after, "logistic_after", title="After balancing")
+        display_threshold_explorer("logistic_after", after)
+    else:
+        display_carousel(carousel_figures(site_content()["carousels"], "logistic"), state_key="logistic_carousel_index")
 
-    with logistic_button_col3:
-        # Next Button
-        if st.button("Next (Logistic)", key="log_next_button"):
-            st.session_state.logistic_carousel_index = (st.session_state.logistic_carousel_index + 1) % logistic_total_images
-    
     # Concluding paragraph
     st.markdown(
         """
@@ -512,8 +1024,9 @@ Note that this model was trained on a slightly modified dataset, the reasons for
         unsafe_allow_html=True
     )
 
-
-    # SVM Regression Results & Discussion Subsection
+# SVM Results & Discussion Section
+@instrumentation.timed("section")
+def display_svm_results():
     st.markdown('<div class="subsection-header" id="svm-results-discussion">SVM Results & Discussion</div>', unsafe_allow_html=True)
     
     st.markdown(
@@ -523,27 +1036,13 @@ Note that this model was trained on a slightly modified dataset, the reasons for
         unsafe_allow_html=True
     )
 
-    try:
-        image_path = "svm_images/svm_performance_metrics.png"  # Ensure the folder is named 'cnn_images'
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found at path: {image_path}")
-        image = Image.open(image_path)
-        st.image(image, caption='SVM Performance Metrics', use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {image_path}: {e}")
-
-    # Create a table with metrics and values
-    svm_metrics = {
-        "Metric": ["Accuracy", "Precision", "Recall", "F1 Score"],
-        "Value": [0.7646, 0.8463, 0.7646, 0.7858]
-    }
-    df_svm_metrics = pd.DataFrame(svm_metrics)
-
-    def table_to_html(df):
-        return df.to_html(index=False, classes='contribution-table', escape=False)
+    svm = live_evaluation("svm")
+    if svm is None:
+        display_image(site_content()["figures"]["svm_metrics"], caption='SVM Performance Metrics')
 
     st.markdown("**Performance Metrics:**", unsafe_allow_html=True)
-    st.markdown(table_to_html(df_svm_metrics), unsafe_allow_html=True)
+    st.markdown(table_to_html(site_content()["metrics"]["svm"] if svm is None else metrics_table({"Value": svm})),
+                unsafe_allow_html=True)
 
     # Explanations for each metric
     st.markdown(
@@ -560,41 +1059,11 @@ Note that this model was trained on a slightly modified dataset, the reasons for
 
     st.markdown("**Additional Visualizations:**", unsafe_allow_html=True)
 
-    # Define SVM images
-    svm_carousel_images = [
-        "svm_images/svm_roc.png",
-        "svm_images/svm_confusion_matrix.png"
-    ]
-
-    # Use a unique session state for the SVM carousel
-    if 'svm_carousel_index' not in st.session_state:
-        st.session_state.svm_carousel_index = 0
-
-    svm_total_images = len(svm_carousel_images)
-
-    # Display the current image
-    current_svm_image_path = svm_carousel_images[st.session_state.svm_carousel_index]
-    try:
-        if not os.path.exists(current_svm_image_path):
-            raise FileNotFoundError(f"Image not found at path: {current_svm_image_path}")
-        current_svm_image = Image.open(current_svm_image_path)
-        st.image(current_svm_image, caption=os.path.basename(current_svm_image_path), use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {current_svm_image_path}: {e}")
-
-    # Create two columns for navigation buttons
-    svm_button_col1, svm_button_col2, svm_button_col3 = st.columns([1, 2, 1])
-
-    with svm_button_col1:
-        pass
-
-    with svm_button_col2:
-        if st.button("Previous (SVM)", key="svm_prev_button"):
-            st.session_state.svm_carousel_index = (st.session_state.svm_carousel_index - 1) % svm_total_images
-
-    with svm_button_col3:
-        if st.button("Next (SVM)", key="svm_next_button"):
-            st.session_state.svm_carousel_index = (st.session_state.svm_carousel_index + 1) % svm_total_images
+    if svm is not None:
+        display_evaluation(svm, "svm")
+        display_threshold_explorer("svm", svm)
+    else:
+        display_carousel(carousel_figures(site_content()["carousels"], "svm"), state_key="svm_carousel_index")
 
     # Concluding paragraph
     st.markdown(
@@ -611,7 +1080,9 @@ Note that this model was trained on a slightly modified dataset, the reasons for
         unsafe_allow_html=True
     )
 
-    # Comparison Results & Discussion Subsection
+# Comparison Section
+@instrumentation.timed("section")
+def display_comparison():
     st.markdown('<div class="subsection-header" id="comparison-results-discussion">Comparison and an Aside on Error</div>', unsafe_allow_html=True)
     st.markdown(
         """
@@ -620,14 +1091,7 @@ Note that this model was trained on a slightly modified dataset, the reasons for
         unsafe_allow_html=True
     )
 
-    try:
-        image_path = "comparison_images/leakage_investigation.png"  # Ensure the folder is named 'cnn_images'
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found at path: {image_path}")
-        image = Image.open(image_path)
-        st.image(image, caption='Leakage Investigation', use_container_width=True)
-    except Exception as e:
-        st.error(f"Error loading image {image_path}: {e}")
+    display_image(site_content()["figures"]["leakage_investigation"], caption='Leakage Investigation')
 
     st.markdown(
         """
@@ -643,8 +1107,9 @@ As expected, the SVM and logistic regression models performed worse than the CNN
         unsafe_allow_html=True
     )
 
-
-    # Next Steps Results & Discussion Subsection
+# Next Steps Section
+@instrumentation.timed("section")
+def display_next_steps():
     st.markdown('<div class="subsection-header" id="next-steps-results-discussion">Next Steps</div>', unsafe_allow_html=True)
     st.markdown(
         """
@@ -653,7 +1118,9 @@ As expected, the SVM and logistic regression models performed worse than the CNN
         unsafe_allow_html=True
     )
 
-    # References Section 
+# References Section
+@instrumentation.timed("section")
+def display_references():
     st.markdown("### <a id='references'></a>**References**", unsafe_allow_html=True)
     st.markdown(
         "[1] A. Bhandarkar et al., “Deep learning based computer aided diagnosis of Alzheimer’s disease: A snapshot of last 5 years, gaps, and future directions,” Artificial Intelligence Review, vol. 57, no. 2, Feb. 2024. doi:10.1007/s10462-023-10644-8 <br><br>"
@@ -662,116 +1129,60 @@ As expected, the SVM and logistic regression models performed worse than the CNN
         unsafe_allow_html=True
     )
 
+# Gantt Chart Section
+@instrumentation.timed("section")
+def display_gantt_chart():
     st.markdown("### <a id='gantt-chart'></a>**Gantt Chart**", unsafe_allow_html=True)
-    st.image("gantt_chart.png", caption='Gantt Chart', use_container_width=True)
+    display_image(site_content()["figures"]["gantt_chart"], caption='Gantt Chart')
 
 # Contribution Section 
 # --------------------
 # Display Functions
 # --------------------
-def display_contributions(names):
+def contributions_table(stage):
+    """
+    Returns the contributions of one stage of the content file ("final",
+    "midpoint" or "proposal") as a table_to_html() table, one bulleted cell per team member.
+    """
+    content = site_content()
+    names = [member["name"] for member in content["team"]]
+    contributions = content["contributions"][stage]
+    return {
+        "Team Member": names,
+        "Contribution": ["<br>".join(f"• {item}" for item in contributions.get(name, [])) for name in names]
+    }
+
+@instrumentation.timed("section")
+def display_contributions():
     """
     Displays the Contributions section with three styled tables:
     1. Final Contributions
     2. Midpoint Contributions
     3. Proposal Contributions
-
-    Args:
-        names (list): List of team member names.
     """
     st.markdown('<div class="title" id="contributions">Contributions</div>', unsafe_allow_html=True)
-     # Function to Convert DataFrame to HTML Table
-    def table_to_html(df):
-        return df.to_html(index=False, classes='contribution-table', escape=False)
     
     # Final Contributions
     st.markdown("#### <a id='final-contributions'></a>**Final Contributions**", unsafe_allow_html=True)
     
-    final_contribution_data = {
-        "Team Member": names,
-        "Contribution": [
-            "• Managed Website<br>"
-            "• SVM Preprocessing, Model, and Visualization<br>"
-            "• SVM Analysis<br>"
-            "• YouTube Script/Slides",
-            
-            "• Data Visualization<br>"
-            "• Results & Discussions<br>"
-            "• Overall Comparison<br>"
-            "• YouTube Script/Slides/Video",
-            
-            "• Logistic Regression Preprocessing and Model",
-            
-            "• Gradcam Implementation",
-            
-            "• Data Visualization<br>"
-            "• Results and Discussions<br>"
-            "• Overall Comparison<br>"
-            "• YouTube Script/Slides"
-        ]
-    }
-    df_final = pd.DataFrame(final_contribution_data)
-    st.markdown(table_to_html(df_final), unsafe_allow_html=True)
+    st.markdown(table_to_html(contributions_table("final")), unsafe_allow_html=True)
     
     # Midpoint Contributions
     st.markdown("#### <a id='midpoint-contributions'></a>**Midpoint Contributions**", unsafe_allow_html=True)
     
-    midpoint_contribution_data = {
-        "Team Member": names,
-        "Contribution": [
-            "• Managed Website<br>"
-            "• Preprocessing Implementation<br>"
-            "• Method Analysis",
-            
-            "• Data Visualization<br>"
-            "• Results and Discussions<br>"
-            "• Method Analysis",
-            
-            "• Preprocessing Implementation",
-            
-            "• Environment Setup<br>"
-            "• Preprocessing Implementation<br>"
-            "• CNN Implementation",
-            
-            "• Data Visualization<br>"
-            "• Results and Discussions<br>"
-            "• Method Analysis"
-        ]
-    }
-    df_midpoint = pd.DataFrame(midpoint_contribution_data)
-    st.markdown(table_to_html(df_midpoint), unsafe_allow_html=True)
+    st.markdown(table_to_html(contributions_table("midpoint")), unsafe_allow_html=True)
     
     # Proposal Contributions 
     st.markdown("#### <a id='proposal-contributions'></a>**Proposal Contributions**", unsafe_allow_html=True)
     
-    proposal_contribution_data = {
-        "Team Member": names,
-        "Contribution": [
-            "• Managed Website<br>"
-            "• Problem Definition<br>"
-            "• Potential Results & Discussions",
-            
-            "• Introduction & Background<br>"
-            "• Potential Results & Discussions",
-            
-            "• Problem Definition<br>"
-            "• Methods",
-            
-            "• Methods<br>"
-            "• References",
-            
-            "• Introduction & Background<br>"
-            "• References"
-        ]
-    }
-    df_proposal = pd.DataFrame(proposal_contribution_data)
-    st.markdown(table_to_html(df_proposal), unsafe_allow_html=True)
+    st.markdown(table_to_html(contributions_table("proposal")), unsafe_allow_html=True)
     
    
     
 
 
 # Git Repo Section 
+@instrumentation.timed("section")
 def display_gitrepo():
     """
     Displays the GitHub Repository link as an embedded badge.
@@ -782,59 +1193,228 @@ def display_gitrepo():
         unsafe_allow_html=True
     )
 
+# Classifier Section
+@st.cache_resource(max_entries=len(CLASSIFIER_MODELS), show_spinner=False)
+def _load_classifier(model_path, mtime):
+    """
+    Loads a model once per (path, mtime), shared by every session in the process.
+    """
+    import mri_classifier  # Brings in NumPy, which no other page needs
+
+    return mri_classifier.load_model(model_path)
+
+@st.cache_resource(show_spinner=False)
+def _prediction_cache():
+    """
+    The process-wide prediction cache.
+    """
+    import prediction_cache
+
+    return prediction_cache.PredictionCache(PREDICTION_CACHE_MEMORY_BYTES, PREDICTION_CACHE_DIR,
+                                            PREDICTION_CACHE_DISK_BYTES)
+
+def _cache_caption():
+    """
+    Summarizes the prediction cache's counters and size, per scan: every scan
+    looks up its scores, and only those that miss look up their pixels.
+    """
+    stats = _prediction_cache().stats()
+    empty = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+    scores = stats["lookups"].get("scores", empty)
+    pixels = stats["lookups"].get("pixels", empty)
+    score_hits = scores["memory_hits"] + scores["disk_hits"]
+    pixel_hits = pixels["memory_hits"] + pixels["disk_hits"]
+    return (f"Cache: {score_hits} of {score_hits + scores['misses']} scans had their scores cached "
+            f"({scores['disk_hits']} from disk), {pixel_hits} more their decoded pixels; "
+            f"{stats['memory_bytes'] / 1e6:.1f}MB in memory, {stats['disk_bytes'] / 1e6:.1f}MB on disk.")
+
+def _choose_classifier(key):
+    """
+    Shows the model picker and returns the chosen model, or None, after saying
+    so, when no model has been exported.
+    """
+    available = {name: path for name, path in CLASSIFIER_MODELS.items() if os.path.exists(path)}
+    if not available:
+        st.info(
+            "No exported model found. Export one from the notebooks with `mri_classifier.export_model()` to "
+            + " or ".join(f"`{path}`" for path in CLASSIFIER_MODELS.values()) + "."
+        )
+        return None
+    model_name = st.radio("Model", list(available), horizontal=True, key=key)
+    model_path = available[model_name]
+    return _load_classifier(model_path, os.stat(model_path).st_mtime_ns)
+
+@instrumentation.timed("section")
+def display_classifier():
+    """
+    Lets visitors upload a brain MRI scan and classifies it with the exported
+    logistic regression or SVM model, entirely in NumPy.
+    """
+    st.markdown('<div class="title" id="classify-scan">Classify a Scan</div>', unsafe_allow_html=True)
+    model = _choose_classifier("classifier_model")
+    if model is None:
+        return
+    uploaded = st.file_uploader("Upload a brain MRI scan", type=["png", "jpg", "jpeg"])
+    if uploaded is None:
+        return
+
+    import mri_classifier
+
+    start = time.perf_counter()
+    (_, scores, error), = next(mri_classifier.classify_stream(
+        model, [(uploaded.name, uploaded.getvalue)], max_workers=1, cache=_prediction_cache()
+    ))
+    if error:
+        st.error(f"Error classifying {uploaded.name}: {error}")
+        return
+    elapsed = time.perf_counter() - start
+
+    st.image(uploaded.getvalue(), caption=uploaded.name, width=300)
+    st.markdown(f"**Prediction:** {model.classes[int(scores.argmax())]}")
+    score_name = "SVM Margin" if model.probabilities == "none" else "Probability"
+    st.markdown(table_to_html({"Class": model.classes, score_name: [float(score) for score in scores]}),
+                unsafe_allow_html=True)
+    st.caption(f"Classified in {elapsed * 1000:.1f} ms. This is a course project, not a diagnostic tool.")
+    st.caption(_cache_caption())
+
+def _count_predictions(results, classes, counts):
+    """
+    Adds classify_stream() results to `counts`, a class -> scans dict, under None when unreadable.
+    """
+    for _, scores, _ in results:
+        label = None if scores is None else classes[int(scores.argmax())]
+        counts[label] = counts.get(label, 0) + 1
+
+def _show_batch_progress(progress, summary, done, total, elapsed, counts):
+    """
+    Updates the batch page's progress bar and per-class counts.
+    """
+    rate = done / elapsed if elapsed else 0
+    progress.progress(done / total, text=f"{done} of {total} scans, {rate:.0f} images/s")
+    summary.markdown(table_to_html({
+        "Prediction": ["Could not be read" if label is None else label for label in counts],
+        "Scans": list(counts.values())
+    }), unsafe_allow_html=True)
+
+@instrumentation.timed("section")
+def display_batch_classifier():
+    """
+    Classifies many scans at once, uploaded as images or zip archives. Scans are
+    decoded in a thread pool and classified in fixed-size chunks (see
+    mri_classifier.classify_stream), with the counts updated after every chunk.
+    """
+    st.markdown('<div class="title" id="batch-classify">Batch Classification</div>', unsafe_allow_html=True)
+    model = _choose_classifier("batch_classifier_model")
+    if model is None:
+        return
+    files = st.file_uploader("Upload brain MRI scans, or zip archives of them", type=["png", "jpg", "jpeg", "zip"],
+                             accept_multiple_files=True)
+    if not files:
+        return
+
+    import mri_classifier
+
+    # Results are kept per upload and model, so reruns (e.g. the download) do not classify again
+    key = (model, tuple(file.file_id for file in files))
+    previous = st.session_state.get("batch_results")
+    progress = st.empty()
+    summary = st.empty()
+    if previous is not None and previous[0] == key:
+        _, results, elapsed = previous
+        counts = dict.fromkeys(model.classes, 0)
+        _count_predictions(results, model.classes, counts)
+        _show_batch_progress(progress, summary, len(results), len(results), elapsed, counts)
+    else:
+        try:
+            scans = mri_classifier.collect_scans(files)
+        except Exception as e:
+            st.error(f"Error reading the upload: {e}")
+            return
+        if not scans:
+            st.warning("No PNG or JPEG scans found in the upload.")
+            return
+        results = []
+        counts = dict.fromkeys(model.classes, 0)
+        start = time.perf_counter()
+        for chunk in mri_classifier.classify_stream(model, scans, cache=_prediction_cache()):
+            results.extend(chunk)
+            _count_predictions(chunk, model.classes, counts)
+            elapsed = time.perf_counter() - start
+            _show_batch_progress(progress, summary, len(results), len(scans), elapsed, counts)
+        st.session_state["batch_results"] = (key, results, elapsed)
+
+    failed = [(name, error) for name, scores, error in results if scores is None]
+    if failed:
+        with st.expander(f"{len(failed)} scans could not be read"):
+            st.markdown("\n".join(f"- `{name}`: {error}" for name, error in failed))
+    # The CSV is only built when the button is clicked
+    st.download_button("Download predictions (CSV)", data=functools.partial(mri_classifier.predictions_csv,
+                       results, model.classes), file_name="predictions.csv", mime="text/csv", on_click="ignore")
+    st.caption(f"Classified {len(results)} scans in {elapsed:.2f} s. This is a course project, not a diagnostic tool.")
+    st.caption(_cache_caption())
+
+# Navigation
+# Display function of each page, by URL path. The pages' titles, order and
+# sidebar groups come from the "sections" of the content file; URL paths are
+# the anchor ids of the one-page layout in its "sidebar" links.
+SECTION_DISPLAYS = {
+    "team-members": display_team_members,
+    "project-proposal": display_video_overview,
+    "introduction": display_introduction,
+    "problem-definition": display_problem_definition,
+    "methods": display_methods,
+    "cnn-results-discussion": display_cnn_results,
+    "logistic-results-discussion": display_logistic_results,
+    "svm-results-discussion": display_svm_results,
+    "comparison-results-discussion": display_comparison,
+    "next-steps-results-discussion": display_next_steps,
+    "classify-scan": display_classifier,
+    "batch-classify": display_batch_classifier,
+    "references": display_references,
+    "gantt-chart": display_gantt_chart,
+    "contributions": display_contributions,
+    "git-repo": display_gitrepo
+}
+
+def report_pages():
+    """
+    Returns the sections of the content file as st.Page objects grouped for
+    st.navigation, the first one being the default. Each page runs only its own
+    section, so a visit only executes and sends what is on screen.
+    """
+    pages = {}
+    for section in site_content()["sections"]:
+        pages.setdefault(section["group"], []).append(st.Page(
+            SECTION_DISPLAYS[section["path"]], title=section["title"], url_path=section["path"], default=not pages
+        ))
+    return pages
+
 # Main Application
 def main():
     """
     Main function to run the Streamlit application.
     """
-    # Apply custom CSS
-    apply_custom_css()
-
-    # Display Header
-    display_header()
-
-    # Sidebar for navigation
-    st.sidebar.title("Navigation")
-    st.sidebar.markdown("[Team Members](#team-members)")
-    st.sidebar.markdown("[Video Overview](#project-proposal)")
-    st.sidebar.markdown("[Final Findings](#final-findings)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Introduction & Background](#introduction)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Problem Definition](#problem-definition)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Methods](#methods)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[CNN Model](#cnn-model)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[Logistic Regression Model](#logistic-regression-model)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[SVM Model](#svm-model)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Results & Discussion](#results-discussion)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[CNN Results & Discussion](#cnn-results-discussion)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[Logistic Regression Results & Discussion](#logistic-results-discussion)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[SVM Results & Discussion](#svm-results-discussion)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[Comparison and an Aside on Error](#comparison-results-discussion)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;[Next Steps](#next-steps-results-discussion)")
-    st.sidebar.markdown("[References](#references)")
-    st.sidebar.markdown("[Gantt Chart](#gantt-chart)")
-    st.sidebar.markdown("[Contributions](#contributions)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Final Contributions](#final-contributions)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Midpoint Contributions](#midpoint-contributions)")
-    st.sidebar.markdown("&nbsp;&nbsp;&nbsp;[Proposal Contributions](#proposal-contributions)")
-    st.sidebar.markdown("[GitHub Repository](#git-repo)")
-
-    # Define team members
-    team_members = ["Erin Tan", "Eileen Yang", "Wesley Tam", "Tong Jing", "Steven Li"]
-    team_links = [
-        "https://www.linkedin.com/in/erinctan/",
-        "https://www.linkedin.com/in/eileenyang10/",
-        "https://www.linkedin.com/in/wesley-tam-64a83b271/",
-        "https://www.linkedin.com/in/tong-jing-05y/",
-        "https://www.linkedin.com/in/stevenliii/"
-    ]
-
-    # Display sections
-    display_team_members(team_members, team_links)
-    display_project_proposal()
-    display_contributions(team_members)
-
-    # Display Github Repo
-    display_gitrepo()
+    # Checks the figures and warms up their caches, once per process (see asset_registry.py).
+    # With APP_STRICT_ASSETS set, missing figures keep every run from rendering the report
+    try:
+        asset_registry.start()
+    except asset_registry.AssetError as e:
+        st.error(f"The report is unavailable: figures are missing or unreadable ({e}).")
+        st.stop()
+    # Times the whole run per page when APP_METRICS is set (see instrumentation.py)
+    with instrumentation.rerun() as rerun:
+        # Apply custom CSS
+        apply_custom_css()
+
+        # Display Header
+        display_header()
+
+        # Sidebar navigation: runs only the selected section
+        # (export_static.py renders every section on one page, with a sidebar of anchor links)
+        page = st.navigation(report_pages(), expanded=True)
+        # The default page has an empty path
+        rerun.name = page.url_path or site_content()["sections"][0]["path"]
+        page.run()
 
 if __name__ == "__main__":
     main()
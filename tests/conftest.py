@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules live at the repository root, which has no package metadata
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def restore_main_module():
+    """
+    AppTest runs its script as __main__ and leaves it in sys.modules, where
+    processes started with "spawn" (see evaluation.bootstrap_intervals) would
+    run it again.
+    """
+    main = sys.modules["__main__"]
+    yield
+    sys.modules["__main__"] = main
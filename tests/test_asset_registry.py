@@ -0,0 +1,72 @@
+"""
+Tests of how asset_registry.py recovers from failures at startup.
+"""
+import importlib
+import os
+import time
+
+import pytest
+
+import asset_registry
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    A fresh registry for the repository, whose warm-up does nothing.
+    """
+    monkeypatch.chdir(REPO_ROOT)
+    module = importlib.reload(asset_registry)
+    monkeypatch.setattr(module, "warm_up", lambda figures, referenced: [])
+    yield module
+    importlib.reload(asset_registry)
+
+
+def wait_until_settled(registry):
+    deadline = time.monotonic() + 10
+    while registry.status()["state"] == "warming" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return registry.status()
+
+
+def test_failed_build_is_reported_and_retried(registry, monkeypatch):
+    build = registry.build
+
+    def failing_build():
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(registry, "build", failing_build)
+    registry.start(strict=False)
+    status = registry.status()
+    assert status["state"] == "idle"
+    assert "disk gone" in status["error"]
+
+    monkeypatch.setattr(registry, "build", build)
+    registry.start(strict=False)
+    status = wait_until_settled(registry)
+    assert status["state"] == "ready"
+    assert status["error"] is None
+
+
+def test_failed_strict_build_keeps_failing(registry, monkeypatch):
+    def failing_build():
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(registry, "build", failing_build)
+    for _ in range(2):
+        with pytest.raises(registry.AssetError, match="disk gone"):
+            registry.start(strict=True)
+    assert registry.status()["state"] == "failed"
+
+
+def test_failed_warm_up_is_ready_with_its_error(registry, monkeypatch):
+    def failing_warm_up(figures, referenced):
+        raise MemoryError("out of memory")
+
+    monkeypatch.setattr(registry, "warm_up", failing_warm_up)
+    registry.start(strict=False)
+    status = wait_until_settled(registry)
+    assert status["state"] == "ready"
+    assert "out of memory" in status["error"]
@@ -0,0 +1,79 @@
+"""
+The carousels' figures in the URL, across page switches (see
+_sync_carousel_query_param() in streamlit_app.py).
+"""
+import logging
+import os
+
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE = "logistic-results-discussion"
+STATE_KEY = "logistic_carousel_index"
+PARAM = "logistic_carousel"
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)  # AppTest warns on every run outside `streamlit run`
+
+
+def app_script(repo_root):
+    import os
+    import sys
+
+    import streamlit as st
+
+    os.chdir(repo_root)
+    sys.path.insert(0, repo_root)
+    import streamlit_app
+
+    streamlit_app.main()
+    # Opens the page named by ?page= with st.switch_page(), which drops the query
+    # parameters of the page it leaves, as a click in the sidebar does. AppTest
+    # starts every run on the default page, so every run switches once
+    url_path = st.query_params.get("page")
+    if url_path and st.session_state.pop("switched_to", None) != url_path:
+        st.session_state["switched_to"] = url_path
+        st.switch_page(st.Page(streamlit_app.SECTION_DISPLAYS[url_path], url_path=url_path),
+                       query_params={"page": url_path})
+
+
+def switch_page(app, url_path):
+    """
+    Opens a page of st.navigation from the next run on. AppTest.switch_page()
+    only takes page files, and the report's pages are functions, so the test
+    script switches to the page named in the query parameters instead.
+    """
+    app.query_params["page"] = url_path
+    return app
+
+
+def click(app, index):
+    """
+    Selects a slide the way the carousel frontend reports it.
+    """
+    app.session_state[STATE_KEY] = index
+    app.session_state[f"{STATE_KEY}_carousel"] = {"index": index, "have": [], "thumbnails": True, "width": 1408}
+    return app.run()
+
+
+def test_figure_is_named_again_after_switching_pages():
+    app = AppTest.from_function(app_script, args=(REPO_ROOT,), default_timeout=60).run()
+    switch_page(app, PAGE).run()
+    click(app, 2)
+    assert app.query_params.get(PARAM) == "log_roc_after"
+
+    switch_page(app, "introduction").run()
+    assert PARAM not in app.query_params
+    switch_page(app, PAGE).run()
+
+    assert not app.exception
+    assert app.session_state[STATE_KEY] == 2
+    assert app.query_params.get(PARAM) == "log_roc_after"
+
+
+def test_first_figure_leaves_the_url_clean():
+    app = AppTest.from_function(app_script, args=(REPO_ROOT,), default_timeout=60).run()
+    switch_page(app, PAGE).run()
+    click(app, 2)
+    click(app, 0)
+
+    assert PARAM not in app.query_params
@@ -0,0 +1,71 @@
+"""
+Tests of the ROC and precision-recall curves of evaluation.py against scikit-learn.
+"""
+import numpy as np
+import pytest
+
+import evaluation
+
+metrics = pytest.importorskip("sklearn.metrics")
+
+
+def binary_predictions(seed, decimals):
+    """
+    Labels of one class against the rest, and scores rounded to `decimals`, which ties many of them.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(20, 400))
+    positive = rng.random(n) < rng.uniform(0.05, 0.95)
+    scores = np.round(rng.random(n) + positive * rng.uniform(0, 1), decimals)
+    return positive, scores
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("decimals", [1, 2, 6])
+def test_roc_and_precision_recall_match_scikit_learn(seed, decimals):
+    positive, scores = binary_predictions(seed, decimals)
+    points = evaluation.operating_points(positive, scores)
+
+    fpr, tpr = evaluation.roc_curve(*points)
+    assert evaluation.auc(fpr, tpr) == pytest.approx(metrics.roc_auc_score(positive, scores))
+    # scikit-learn keeps one more point on the first straight run, otherwise the curves are the same
+    expected_fpr, expected_tpr, _ = metrics.roc_curve(positive, scores)
+    assert set(zip(fpr, tpr)) <= set(zip(expected_fpr, expected_tpr))
+    assert (fpr[0], tpr[0]) == (0, 0) and (fpr[-1], tpr[-1]) == (1, 1)
+
+    recall, precision = evaluation.pr_curve(*points)
+    assert evaluation.average_precision(recall, precision) == pytest.approx(
+        metrics.average_precision_score(positive, scores))
+
+
+def test_all_scores_tied():
+    positive = np.array([True, False, True, False, False])
+    scores = np.full(5, 0.5)
+    points = evaluation.operating_points(positive, scores)
+    fpr, tpr = evaluation.roc_curve(*points)
+    np.testing.assert_array_equal(fpr, [0, 1])
+    np.testing.assert_array_equal(tpr, [0, 1])
+    assert evaluation.auc(fpr, tpr) == pytest.approx(metrics.roc_auc_score(positive, scores))
+    recall, precision = evaluation.pr_curve(*points)
+    assert evaluation.average_precision(recall, precision) == pytest.approx(
+        metrics.average_precision_score(positive, scores))
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("present", [True, False])
+def test_single_class(tmp_path, present):
+    """
+    A class that every test scan belongs to, or none does: scikit-learn's AUC
+    is NaN and its average precision 1 or 0, and evaluate() reports the same.
+    """
+    labels = np.zeros(6, dtype=int) if present else np.ones(6, dtype=int)
+    scores = np.array([[0.9, 0.1], [0.6, 0.4], [0.6, 0.4], [0.3, 0.7], [0.2, 0.8], [0.55, 0.45]])
+    path = tmp_path / "predictions.npz"
+    evaluation.export_predictions(path, labels, scores, ["first", "second"])
+    result = evaluation.evaluate(path, cache_dir=tmp_path / "cache")
+
+    positive = labels == 0
+    assert np.isnan(metrics.roc_auc_score(positive, scores[:, 0]))
+    assert np.isnan(result["per_class"]["auc"][0])
+    assert result["per_class"]["average_precision"][0] == pytest.approx(
+        metrics.average_precision_score(positive, scores[:, 0]))
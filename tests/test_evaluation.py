@@ -0,0 +1,120 @@
+"""
+Tests of evaluation.py.
+"""
+import numpy as np
+import pytest
+
+import evaluation
+
+
+def tied_predictions(n=3000, n_classes=4, seed=0):
+    """
+    Labels and scores rounded to one decimal, so many scans tie between classes.
+    """
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(n_classes, size=n)
+    scores = np.round(rng.random((n, n_classes)), 1)
+    return labels, scores
+
+
+def test_threshold_sweep_at_zero_matches_argmax_on_ties():
+    labels, scores = tied_predictions()
+    n_classes = scores.shape[1]
+    expected = evaluation.confusion_matrix(labels, scores.argmax(axis=1), n_classes)
+    for class_index in range(n_classes):
+        sweep = evaluation.ThresholdSweep(labels, scores, class_index)
+        np.testing.assert_array_equal(sweep.confusion(0.0), expected)
+
+
+def test_threshold_sweep_matches_direct_count():
+    labels, scores = tied_predictions(seed=1)
+    n_classes = scores.shape[1]
+    for class_index in range(n_classes):
+        sweep = evaluation.ThresholdSweep(labels, scores, class_index)
+        others = scores.copy()
+        others[:, class_index] = -np.inf
+        fallback = others.argmax(axis=1)
+        margins = scores[:, class_index] - others[np.arange(len(labels)), fallback]
+        for threshold in (-0.3, -0.1, 0.0, 0.1, 0.25):
+            wins = (margins > threshold) | ((margins == threshold) & (class_index < fallback))
+            predicted = np.where(wins, class_index, fallback)
+            np.testing.assert_array_equal(sweep.confusion(threshold),
+                                          evaluation.confusion_matrix(labels, predicted, n_classes))
+
+
+def largest_dropped_distance(x, y, kept):
+    """
+    Distance of the dropped point farthest from the line through its kept neighbours, computed directly.
+    """
+    largest = 0.0
+    for start, end in zip(kept[:-1], kept[1:]):
+        dx, dy = x[end] - x[start], y[end] - y[start]
+        for i in range(start + 1, end):
+            distance = abs(dy * (x[i] - x[start]) - dx * (y[i] - y[start])) / np.hypot(dx, dy)
+            largest = max(largest, distance)
+    return largest
+
+
+def roc_points(n, seed):
+    rng = np.random.default_rng(seed)
+    positive = rng.random(n) < 0.3
+    scores = rng.random(n) + positive * 0.8
+    return evaluation.roc_curve(*evaluation.operating_points(positive, scores))
+
+
+def test_decimate_keeps_the_endpoints_within_tolerance():
+    for seed in range(5):
+        fpr, tpr = roc_points(5000, seed)
+        kept, distance = evaluation.decimate(fpr, tpr, max_points=len(fpr))
+        assert kept[0] == 0 and kept[-1] == len(fpr) - 1
+        assert np.all(np.diff(kept) > 0)
+        assert len(kept) < len(fpr)
+        assert distance <= evaluation.CURVE_TOLERANCE
+        assert largest_dropped_distance(fpr, tpr, kept) == pytest.approx(distance)
+
+
+def test_decimate_stops_at_max_points():
+    fpr, tpr = roc_points(5000, 0)
+    kept, distance = evaluation.decimate(fpr, tpr, max_points=20, tolerance=0)
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == len(fpr) - 1
+    assert largest_dropped_distance(fpr, tpr, kept) == pytest.approx(distance)
+
+
+def test_decimate_short_curves():
+    for n in range(3):
+        kept, distance = evaluation.decimate(np.arange(n, dtype=float), np.arange(n, dtype=float))
+        np.testing.assert_array_equal(kept, np.arange(n))
+        assert distance == 0
+
+
+def predictions_with_accuracy(n, accuracy, n_classes=4, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(n_classes, size=n)
+    wrong = rng.random(n) >= accuracy
+    predicted = np.where(wrong, (labels + rng.integers(1, n_classes, size=n)) % n_classes, labels)
+    return labels, predicted
+
+
+def test_bootstrap_accuracy_interval_matches_normal_approximation():
+    labels, predicted = predictions_with_accuracy(4000, 0.9)
+    intervals = evaluation.bootstrap_intervals(labels, predicted, 4, resamples=2000)
+    accuracy = np.mean(labels == predicted)
+    half_width = 1.96 * np.sqrt(accuracy * (1 - accuracy) / len(labels))
+    low, high = intervals["accuracy"]
+    assert low == pytest.approx(accuracy - half_width, abs=0.002)
+    assert high == pytest.approx(accuracy + half_width, abs=0.002)
+    for name in evaluation.HEADLINE_METRICS:
+        low, high = intervals[name]
+        point = evaluation.headline_metrics(evaluation.confusion_matrix(labels, predicted, 4))[name]
+        assert low < point < high
+
+
+def test_bootstrap_depends_only_on_the_seed(monkeypatch):
+    labels, predicted = predictions_with_accuracy(500, 0.8)
+    expected = evaluation.bootstrap_intervals(labels, predicted, 4, resamples=600, seed=3)
+    # Several batches per job, and jobs spread over processes, draw the same resamples
+    monkeypatch.setattr(evaluation, "BOOTSTRAP_BATCH_DRAWS", 500 * 7)
+    assert evaluation.bootstrap_intervals(labels, predicted, 4, resamples=600, seed=3) == expected
+    assert evaluation.bootstrap_intervals(labels, predicted, 4, resamples=600, seed=3, workers=2) == expected
+    assert evaluation.bootstrap_intervals(labels, predicted, 4, resamples=600, seed=4) != expected
@@ -0,0 +1,81 @@
+"""
+Tests of the pipelines folded by mri_classifier.py against the scikit-learn pipelines they come from.
+"""
+import numpy as np
+import pytest
+
+import mri_classifier
+
+pipeline = pytest.importorskip("sklearn.pipeline")
+from sklearn.decomposition import PCA  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+from sklearn.svm import LinearSVC  # noqa: E402
+
+IMAGE_SIZE = (8, 6)
+PIXEL_SCALE = 1 / 255
+
+
+def scans(n, n_classes, seed=0):
+    """
+    Random 8x6 grayscale scans as a preprocessed (n, pixels) batch, with labels
+    that depend on their pixels.
+    """
+    rng = np.random.default_rng(seed)
+    batch = rng.integers(0, 256, size=(n, IMAGE_SIZE[0] * IMAGE_SIZE[1])).astype(np.float32)
+    labels = (batch[:, :n_classes].argmax(axis=1) + (rng.random(n) < 0.2)) % n_classes
+    return batch, labels
+
+
+def folded(tmp_path, classifier, n_classes):
+    """
+    Fits scaler + PCA + classifier, exports and reloads them. Returns (fitted
+    pipeline, loaded model, test batch).
+    """
+    batch, labels = scans(300, n_classes)
+    fitted = pipeline.make_pipeline(StandardScaler(), PCA(n_components=10), classifier)
+    fitted.fit(batch * PIXEL_SCALE, labels)
+    scaler, pca, classifier = fitted.steps[0][1], fitted.steps[1][1], fitted.steps[2][1]
+    path = tmp_path / "model.npz"
+    mri_classifier.export_model(path, scaler, pca, classifier, IMAGE_SIZE, pixel_scale=PIXEL_SCALE)
+    test_batch, _ = scans(50, n_classes, seed=1)
+    return fitted, mri_classifier.load_model(path), test_batch
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+@pytest.mark.parametrize("classifier", [LogisticRegression, LinearSVC])
+def test_folded_decision_function_matches_pipeline(tmp_path, classifier, n_classes):
+    fitted, model, batch = folded(tmp_path, classifier(), n_classes)
+    expected = fitted.decision_function(batch * PIXEL_SCALE)
+    scores = model.decision_function(batch)
+    if n_classes == 2:
+        # scikit-learn returns the positive class's column only
+        np.testing.assert_allclose(scores[:, 1], expected, rtol=1e-4, atol=1e-4)
+        np.testing.assert_allclose(scores[:, 0], -expected, rtol=1e-4, atol=1e-4)
+    else:
+        np.testing.assert_allclose(scores, expected, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_probabilities_match_pipeline(tmp_path, n_classes):
+    fitted, model, batch = folded(tmp_path, LogisticRegression(), n_classes)
+    probabilities = model.postprocess(model.decision_function(batch))
+    np.testing.assert_allclose(probabilities, fitted.predict_proba(batch * PIXEL_SCALE), atol=1e-5)
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_one_vs_rest_probabilities(tmp_path, n_classes):
+    """
+    A model fitted with multi_class="ovr" (scikit-learn < 1.8) normalizes one
+    sigmoid per class, or for two classes takes the sigmoid of its single score.
+    """
+    classifier = LogisticRegression()
+    classifier.multi_class = "ovr"
+    fitted, model, batch = folded(tmp_path, classifier, n_classes)
+    assert model.probabilities == "ovr"
+    sigmoids = 1 / (1 + np.exp(-fitted.decision_function(batch * PIXEL_SCALE)))
+    if n_classes == 2:
+        expected = np.c_[1 - sigmoids, sigmoids]
+    else:
+        expected = sigmoids / sigmoids.sum(axis=1, keepdims=True)
+    np.testing.assert_allclose(model.postprocess(model.decision_function(batch)), expected, atol=1e-5)
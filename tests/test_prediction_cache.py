@@ -0,0 +1,70 @@
+"""
+Tests of the memory and disk tiers of prediction_cache.py.
+"""
+import os
+
+import numpy as np
+
+import prediction_cache
+
+ENTRY = np.zeros(100, dtype=np.uint8)  # 100 bytes in memory
+
+
+def digest(i):
+    return f"{i:064x}"
+
+
+def test_memory_tier_evicts_least_recently_used_at_its_limit():
+    cache = prediction_cache.PredictionCache(memory_limit=300)
+    for i in range(3):
+        cache.put(digest(i), "pixels-10x10", ENTRY)
+    cache.get(digest(0), "pixels-10x10")  # 1 is now the least recently used
+    cache.put(digest(3), "pixels-10x10", ENTRY)
+
+    assert cache.stats()["memory_bytes"] == 300
+    assert cache.get(digest(1), "pixels-10x10") is None
+    for i in (0, 2, 3):
+        assert cache.get(digest(i), "pixels-10x10") is not None
+
+
+def test_memory_tier_skips_entries_over_its_limit():
+    cache = prediction_cache.PredictionCache(memory_limit=50)
+    cache.put(digest(0), "pixels-10x10", ENTRY)
+    assert cache.stats()["memory_bytes"] == 0
+    assert cache.get(digest(0), "pixels-10x10") is None
+
+
+def test_disk_tier_evicts_least_recently_used_at_its_limit(tmp_path):
+    file_size = ENTRY.nbytes + 128  # .npy header
+    cache = prediction_cache.PredictionCache(memory_limit=0, disk_dir=str(tmp_path), disk_limit=3 * file_size)
+    for i in range(3):
+        cache.put(digest(i), "pixels-10x10", ENTRY)
+    assert cache.get(digest(0), "pixels-10x10") is not None  # 1 is now the least recently used
+    cache.put(digest(3), "pixels-10x10", ENTRY)
+
+    assert cache.stats()["disk_bytes"] == 3 * file_size
+    files = sorted(name for _, _, names in os.walk(tmp_path) for name in names)
+    assert files == sorted(f"{digest(i)}.pixels-10x10.npy" for i in (0, 2, 3))
+    assert cache.get(digest(1), "pixels-10x10") is None
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    cache = prediction_cache.PredictionCache(memory_limit=10 ** 6, disk_dir=str(tmp_path), disk_limit=10 ** 6)
+    cache.put(digest(0), "scores-abc", np.array([0.25, 0.75]))
+
+    restarted = prediction_cache.PredictionCache(memory_limit=10 ** 6, disk_dir=str(tmp_path), disk_limit=10 ** 6)
+    np.testing.assert_array_equal(restarted.get(digest(0), "scores-abc"), [0.25, 0.75])
+    restarted.get(digest(0), "scores-abc")
+    assert restarted.stats()["lookups"] == {"scores": {"memory_hits": 1, "disk_hits": 1, "misses": 0}}
+
+
+def test_lookups_are_counted_per_kind_of_variant():
+    cache = prediction_cache.PredictionCache(memory_limit=10 ** 6)
+    cache.put(digest(0), "pixels-10x10", ENTRY)
+    # A new scan misses its scores, then finds its pixels
+    assert cache.get(digest(0), "scores-abc") is None
+    assert cache.get(digest(0), "pixels-10x10") is not None
+    assert cache.stats()["lookups"] == {
+        "scores": {"memory_hits": 0, "disk_hits": 0, "misses": 1},
+        "pixels": {"memory_hits": 1, "disk_hits": 0, "misses": 0}
+    }
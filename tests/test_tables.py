@@ -0,0 +1,40 @@
+"""
+Tests of table_to_html() in streamlit_app.py against pandas, whose markup it reproduces.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import streamlit_app
+
+COLUMNS = {
+    "floats": [0.5, 0.25, 0.125],
+    "nan": [0.5, math.nan, 0.25],
+    "none": [0.5, None],
+    "int and float": [0.1, 2],
+    "int and none": [1, None],
+    "all nan": [math.nan, math.nan],
+    "all none": [None, None],
+    "large": [1e20, 0.5],
+    "large but short": [1234567.0, 0.5],
+    "small": [1e-8, 0.5],
+    "negative": [-0.5, 1.25],
+    "infinite": [math.inf, 0.5],
+    "long decimals": [123456.789, 0.1],
+    "numpy": [np.float64(0.5), np.int64(3)],
+    "ints": [1, 2],
+    "bools": [True, False],
+    "strings": ["Accuracy", "F1"],
+    "string and nan": ["a", math.nan],
+    "objects": ["a", None, 0.123456789, 1, True]
+}
+
+
+@pytest.mark.parametrize("name", COLUMNS)
+def test_table_matches_pandas(name):
+    data = {"Metric": [f"m{i}" for i in range(len(COLUMNS[name]))], name: COLUMNS[name]}
+    expected = pd.DataFrame(data).to_html(index=False, escape=False)
+    expected = expected.replace('class="dataframe"', 'class="dataframe contribution-table"')
+    assert streamlit_app.table_to_html(data) == expected